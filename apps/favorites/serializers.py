@@ -38,9 +38,7 @@ class UserFavoriteSerializer(serializers.ModelSerializer):
 
     def validate_movie_id(self, value):
         """Validate that the movie exists."""
-        try:
-            Movie.objects.get(id=value)
-        except Movie.DoesNotExist:
+        if not Movie.objects.filter(id=value).exists():
             raise serializers.ValidationError("Movie not found.")
         return value
 
@@ -199,9 +197,7 @@ class AddToFavoritesSerializer(serializers.Serializer):
 
     def validate_movie_id(self, value):
         """Validate that the movie exists."""
-        try:
-            Movie.objects.get(id=value)
-        except Movie.DoesNotExist:
+        if not Movie.objects.filter(id=value).exists():
             raise serializers.ValidationError("Movie not found.")
         return value
 
@@ -247,9 +243,7 @@ class RemoveFromFavoritesSerializer(serializers.Serializer):
 
     def validate_movie_id(self, value):
         """Validate that the movie exists."""
-        try:
-            Movie.objects.get(id=value)
-        except Movie.DoesNotExist:
+        if not Movie.objects.filter(id=value).exists():
             raise serializers.ValidationError("Movie not found.")
         return value
 
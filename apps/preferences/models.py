@@ -6,7 +6,10 @@ including genre preferences, viewing history, and recommendation settings.
 """
 
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.conf import settings
+from django.utils.functional import cached_property
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -113,29 +116,73 @@ class UserPreference(models.Model):
     def __repr__(self):
         return f"<UserPreference: {self.user.username}>"
 
+    # Derived values memoized per instance; cleared on save() and on changes to
+    # the genre relations (see _clear_preference_cache below).
+    MEMOIZED_PROPERTIES = (
+        "preferred_genre_names",
+        "avoided_genre_names",
+        "preferred_decades_list",
+        "preferred_languages_list",
+        "has_preferred_genres",
+    )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.clear_memoized_properties()
+
+    def clear_memoized_properties(self):
+        """Drop memoized derived values so they are recomputed on next access."""
+        for name in self.MEMOIZED_PROPERTIES:
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def preferred_genre_names(self):
+        """List of preferred genre names (uses prefetched genres if present)."""
+        return [genre.name for genre in self.genres.all()]
+
+    @cached_property
+    def avoided_genre_names(self):
+        """List of avoided genre names (uses prefetched genres if present)."""
+        return [genre.name for genre in self.avoid_genres.all()]
+
+    @cached_property
+    def preferred_decades_list(self):
+        """Preferred decades as a list."""
+        if self.preferred_decades:
+            return [decade.strip() for decade in self.preferred_decades.split(",")]
+        return []
+
+    @cached_property
+    def preferred_languages_list(self):
+        """Preferred languages as a list."""
+        if self.preferred_languages:
+            return [lang.strip() for lang in self.preferred_languages.split(",")]
+        return []
+
+    @cached_property
+    def has_preferred_genres(self):
+        """Whether the user has set any genre preferences."""
+        return bool(self.preferred_genre_names)
+
     def get_preferred_genre_names(self):
         """Get a list of preferred genre names."""
-        return list(self.genres.values_list("name", flat=True))
+        return self.preferred_genre_names
 
     def get_avoided_genre_names(self):
         """Get a list of avoided genre names."""
-        return list(self.avoid_genres.values_list("name", flat=True))
+        return self.avoided_genre_names
 
     def get_preferred_decades_list(self):
         """Get preferred decades as a list."""
-        if self.preferred_decades:
-            return [decade.strip() for decade in self.preferred_decades.split(",")]
-        return []
+        return self.preferred_decades_list
 
     def get_preferred_languages_list(self):
         """Get preferred languages as a list."""
-        if self.preferred_languages:
-            return [lang.strip() for lang in self.preferred_languages.split(",")]
-        return []
+        return self.preferred_languages_list
 
     def has_genre_preferences(self):
         """Check if user has set any genre preferences."""
-        return self.genres.exists()
+        return self.has_preferred_genres
 
     def should_recommend(self, movie):
         """
@@ -237,10 +284,18 @@ class ViewingHistory(models.Model):
         """Check if the movie was completed (>= 90%)."""
         return self.completion_percentage >= 90
 
-    @property
+    @cached_property
     def rating_display(self):
         """Get a display-friendly rating."""
         if self.user_rating:
             stars = "★" * self.user_rating + "☆" * (5 - self.user_rating)
             return f"{stars} ({self.user_rating}/5)"
         return "Not rated"
+
+
+@receiver(m2m_changed, sender=UserPreference.genres.through)
+@receiver(m2m_changed, sender=UserPreference.avoid_genres.through)
+def _clear_preference_cache(sender, instance, action, **kwargs):
+    """Invalidate memoized genre properties when genre relations change."""
+    if action.startswith("post_") and isinstance(instance, UserPreference):
+        instance.clear_memoized_properties()
@@ -1,12 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any
 
+from django.utils import timezone
 from rest_framework import serializers
-from apps.movies.models import Genre
+from apps.movies.models import Genre, Movie
 from apps.movies.serializers import GenreSerializer
 from .models import UserPreference, ViewingHistory
 
+# Scalar fields QuickPreferenceUpdateSerializer may change
+QUICK_UPDATE_FIELDS = (
+    "min_rating",
+    "recommendation_frequency",
+    "include_foreign_films",
+)
 
-class UserPreferenceSerializer(serializers.ModelSerializer):
+# Recently validated genre id sets, so repeat submissions of the same
+# selection skip the existence query. Bounded LRU with a short TTL.
+VALIDATED_GENRE_IDS_MAX_SIZE = 128
+VALIDATED_GENRE_IDS_TTL = 30  # seconds
+_validated_genre_ids: "OrderedDict[frozenset, float]" = OrderedDict()
+_validated_genre_ids_lock = threading.Lock()
+
+
+def validate_genre_id_list(value):
+    """
+    Validate that all genre IDs in ``value`` exist.
+
+    Sets of IDs that passed validation within the last
+    ``VALIDATED_GENRE_IDS_TTL`` seconds are accepted without a database query.
+    """
+    if not value:
+        return value
+
+    key = frozenset(value)
+    now = time.monotonic()
+    with _validated_genre_ids_lock:
+        validated_at = _validated_genre_ids.get(key)
+        if validated_at is not None and now - validated_at < VALIDATED_GENRE_IDS_TTL:
+            _validated_genre_ids.move_to_end(key)
+            return value
+
+    existing_ids = set(Genre.objects.filter(id__in=key).values_list("id", flat=True))
+    invalid_ids = key - existing_ids
+    if invalid_ids:
+        raise serializers.ValidationError(
+            f"Genres with IDs {list(invalid_ids)} do not exist."
+        )
+
+    with _validated_genre_ids_lock:
+        _validated_genre_ids[key] = now
+        _validated_genre_ids.move_to_end(key)
+        while len(_validated_genre_ids) > VALIDATED_GENRE_IDS_MAX_SIZE:
+            _validated_genre_ids.popitem(last=False)
+    return value
+
+
+class EagerLoadingMixin:
+    """
+    Mixin for serializers that declare their related-object lookups.
+
+    Serializers list the relations they render in ``Meta.select_related`` and
+    ``Meta.prefetch_related``; views pass their queryset through
+    ``setup_eager_loading`` so new nested fields cannot reintroduce N+1 queries.
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply the serializer's declared eager-loading lookups to a queryset."""
+        select_related = getattr(cls.Meta, "select_related", ())
+        prefetch_related = getattr(cls.Meta, "prefetch_related", ())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class UserPreferenceSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for user preferences.
 
@@ -30,20 +102,12 @@ class UserPreferenceSerializer(serializers.ModelSerializer):
         allow_empty=True,
     )
 
-    preferred_genre_names = serializers.ListField(
-        source="get_preferred_genre_names", read_only=True
-    )
-    avoided_genre_names = serializers.ListField(
-        source="get_avoided_genre_names", read_only=True
-    )
-    preferred_decades_list = serializers.ListField(
-        source="get_preferred_decades_list", read_only=True
-    )
-    preferred_languages_list = serializers.ListField(
-        source="get_preferred_languages_list", read_only=True
-    )
+    preferred_genre_names = serializers.ListField(read_only=True)
+    avoided_genre_names = serializers.ListField(read_only=True)
+    preferred_decades_list = serializers.ListField(read_only=True)
+    preferred_languages_list = serializers.ListField(read_only=True)
     has_preferences = serializers.BooleanField(
-        source="has_genre_preferences", read_only=True
+        source="has_preferred_genres", read_only=True
     )
 
     class Meta:
@@ -71,32 +135,15 @@ class UserPreferenceSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
+        prefetch_related = ("genres", "avoid_genres")
 
     def validate_genre_ids(self, value):
         """Validate that all genre IDs exist."""
-        if value:
-            existing_ids = set(
-                Genre.objects.filter(id__in=value).values_list("id", flat=True)
-            )
-            invalid_ids = set(value) - existing_ids
-            if invalid_ids:
-                raise serializers.ValidationError(
-                    f"Genres with IDs {list(invalid_ids)} do not exist."
-                )
-        return value
+        return validate_genre_id_list(value)
 
     def validate_avoid_genre_ids(self, value):
         """Validate that all avoid genre IDs exist."""
-        if value:
-            existing_ids = set(
-                Genre.objects.filter(id__in=value).values_list("id", flat=True)
-            )
-            invalid_ids = set(value) - existing_ids
-            if invalid_ids:
-                raise serializers.ValidationError(
-                    f"Genres with IDs {list(invalid_ids)} do not exist."
-                )
-        return value
+        return validate_genre_id_list(value)
 
     def validate_min_rating(self, value):
         """Validate minimum rating is between 0 and 10."""
@@ -121,8 +168,8 @@ class UserPreferenceSerializer(serializers.ModelSerializer):
 
         # Check for overlap between preferred and avoided genres
         if genre_ids and avoid_genre_ids:
-            overlap = set(genre_ids) & set(avoid_genre_ids)
-            if overlap:
+            avoid_set = set(avoid_genre_ids)
+            if any(genre_id in avoid_set for genre_id in genre_ids):
                 raise serializers.ValidationError(
                     "A genre cannot be both preferred and avoided."
                 )
@@ -179,18 +226,16 @@ class UserPreferenceSerializer(serializers.ModelSerializer):
         return instance
 
 
-class UserPreferenceSummarySerializer(serializers.ModelSerializer):
+class UserPreferenceSummarySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for user preference summaries.
 
     Provides a lightweight view of user preferences without full details.
     """
 
-    preferred_genre_names = serializers.ListField(
-        source="get_preferred_genre_names", read_only=True
-    )
+    preferred_genre_names = serializers.ListField(read_only=True)
     has_preferences = serializers.BooleanField(
-        source="has_genre_preferences", read_only=True
+        source="has_preferred_genres", read_only=True
     )
 
     class Meta:
@@ -206,7 +251,7 @@ class UserPreferenceSummarySerializer(serializers.ModelSerializer):
         ]
 
 
-class ViewingHistorySerializer(serializers.ModelSerializer):
+class ViewingHistorySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for viewing history.
 
@@ -232,14 +277,11 @@ class ViewingHistorySerializer(serializers.ModelSerializer):
             "was_completed",
         ]
         read_only_fields = ["id", "watched_at"]
+        select_related = ("movie",)
 
     def validate_movie_id(self, value):
         """Validate that the movie exists."""
-        from apps.movies.models import Movie
-
-        try:
-            Movie.objects.get(id=value)
-        except Movie.DoesNotExist:
+        if not Movie.objects.filter(id=value).exists():
             raise serializers.ValidationError("Movie not found.")
         return value
 
@@ -259,8 +301,6 @@ class ViewingHistorySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create viewing history entry."""
-        from apps.movies.models import Movie
-
         user = self.context["request"].user
         movie_id = validated_data.pop("movie_id")
         movie = Movie.objects.get(id=movie_id)
@@ -291,16 +331,7 @@ class QuickPreferenceUpdateSerializer(serializers.Serializer):
 
     def validate_genre_ids(self, value):
         """Validate that all genre IDs exist."""
-        if value:
-            existing_ids = set(
-                Genre.objects.filter(id__in=value).values_list("id", flat=True)
-            )
-            invalid_ids = set(value) - existing_ids
-            if invalid_ids:
-                raise serializers.ValidationError(
-                    f"Genres with IDs {list(invalid_ids)} do not exist."
-                )
-        return value
+        return validate_genre_id_list(value)
 
     def validate_min_rating(self, value):
         """Validate minimum rating is between 0 and 10."""
@@ -319,17 +350,19 @@ class QuickPreferenceUpdateSerializer(serializers.Serializer):
         if not validated_data:
             return preference
 
-        # Update basic fields
-        if "min_rating" in validated_data:
-            preference.min_rating = validated_data["min_rating"]
-        if "recommendation_frequency" in validated_data:
-            preference.recommendation_frequency = validated_data[
-                "recommendation_frequency"
-            ]
-        if "include_foreign_films" in validated_data:
-            preference.include_foreign_films = validated_data["include_foreign_films"]
-
-        preference.save()
+        # Update only the changed columns in a single UPDATE; auto_now is not
+        # applied by queryset.update(), so updated_at is set explicitly.
+        changes = {
+            field: validated_data[field]
+            for field in QUICK_UPDATE_FIELDS
+            if field in validated_data
+        }
+        if changes or "genre_ids" in validated_data:
+            # Bump updated_at for genre-only changes too; it backs the ETag.
+            changes["updated_at"] = timezone.now()
+            UserPreference.objects.filter(pk=preference.pk).update(**changes)
+            for attr, value in changes.items():
+                setattr(preference, attr, value)
 
         # Update genres if provided
         if "genre_ids" in validated_data:
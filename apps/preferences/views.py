@@ -5,13 +5,17 @@ This module contains API views for user preferences functionality,
 including preference management, viewing history, and recommendation settings.
 """
 
-from rest_framework import generics, permissions, status
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.mixins import RetrieveModelMixin, UpdateModelMixin, CreateModelMixin
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.db import transaction
+from django.utils import timezone
 from typing import Any
+from apps.movies.models import Movie
 from .models import UserPreference, ViewingHistory
 from .serializers import (
     UserPreferenceSerializer,
@@ -20,6 +24,38 @@ from .serializers import (
     QuickPreferenceUpdateSerializer,
 )
 
+# Formats timestamps in hand-built responses the same way serializers do
+DATETIME_FIELD = serializers.DateTimeField()
+
+# Scalar field values restored by reset_preferences
+PREFERENCE_DEFAULTS = {
+    "preferred_decades": "",
+    "min_rating": None,
+    "max_runtime": None,
+    "preferred_languages": "",
+    "include_foreign_films": True,
+    "recommendation_frequency": "weekly",
+    "enable_email_recommendations": False,
+    "include_adult_content": False,
+}
+
+
+def preference_etag(request, *args, **kwargs):
+    """
+    ETag for responses derived solely from the user's preferences.
+
+    Built from the preference row's ``updated_at`` so conditional GETs are
+    answered with 304 before the preference is loaded or serialized.
+    """
+    updated_at = (
+        UserPreference.objects.filter(user=request.user)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return f"{request.user.pk}-{updated_at.timestamp()}"
+
 
 class UserPreferencesView(
     RetrieveModelMixin, UpdateModelMixin, CreateModelMixin, generics.GenericAPIView
@@ -35,9 +71,10 @@ class UserPreferencesView(
 
     def get_object(self) -> Any:
         """Get or create user preferences."""
-        preference, created = UserPreference.objects.get_or_create(
-            user=self.request.user
+        queryset = self.get_serializer_class().setup_eager_loading(
+            UserPreference.objects.all()
         )
+        preference, created = queryset.get_or_create(user=self.request.user)
         return preference
 
     def get(self, request, *args, **kwargs):
@@ -65,6 +102,7 @@ class UserPreferencesView(
         serializer.save(user=self.request.user)
 
 
+@method_decorator(condition(etag_func=preference_etag), name="get")
 class UserPreferencesSummaryView(generics.RetrieveAPIView):
     """
     View for getting a summary of user preferences.
@@ -77,9 +115,10 @@ class UserPreferencesSummaryView(generics.RetrieveAPIView):
 
     def get_object(self) -> Any:
         """Get user preferences summary."""
-        preference, created = UserPreference.objects.get_or_create(
-            user=self.request.user
+        queryset = self.get_serializer_class().setup_eager_loading(
+            UserPreference.objects.all()
         )
+        preference, created = queryset.get_or_create(user=self.request.user)
         return preference
 
 
@@ -95,10 +134,10 @@ class ViewingHistoryListView(generics.ListCreateAPIView):
 
     def get_queryset(self) -> Any:
         """Get viewing history for the authenticated user."""
-        return (
-            ViewingHistory.objects.filter(user=self.request.user)
-            .select_related("movie")
-            .order_by("-watched_at")
+        return self.get_serializer_class().setup_eager_loading(
+            ViewingHistory.objects.filter(user=self.request.user).order_by(
+                "-watched_at"
+            )
         )
 
     def perform_create(self, serializer):
@@ -118,7 +157,9 @@ class ViewingHistoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self) -> Any:
         """Get viewing history for the authenticated user."""
-        return ViewingHistory.objects.filter(user=self.request.user)
+        return self.get_serializer_class().setup_eager_loading(
+            ViewingHistory.objects.filter(user=self.request.user)
+        )
 
 
 @api_view(["POST"])
@@ -143,11 +184,23 @@ def quick_preference_update(request):
                 )
                 preference = user_preference
 
-            response_serializer = UserPreferenceSummarySerializer(preference)
+            # Build the summary payload directly from the updated instance rather
+            # than running it back through UserPreferenceSummarySerializer.
+            min_rating = preference.min_rating
             return Response(
                 {
                     "message": "Preferences updated successfully",
-                    "preferences": response_serializer.data,
+                    "preferences": {
+                        "id": preference.pk,
+                        "preferred_genre_names": preference.preferred_genre_names,
+                        "min_rating": None if min_rating is None else str(min_rating),
+                        "max_runtime": preference.max_runtime,
+                        "recommendation_frequency": preference.recommendation_frequency,
+                        "has_preferences": preference.has_preferred_genres,
+                        "updated_at": DATETIME_FIELD.to_representation(
+                            preference.updated_at
+                        ),
+                    },
                 },
                 status=status.HTTP_200_OK,
             )
@@ -162,8 +215,6 @@ def mark_watched(request, movie_id):
 
     Creates or updates a viewing history entry for the specified movie.
     """
-    from apps.movies.models import Movie
-
     # Get the movie
     movie = get_object_or_404(Movie, id=movie_id)
 
@@ -199,6 +250,7 @@ def mark_watched(request, movie_id):
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@condition(etag_func=preference_etag)
 def preference_recommendations(request):
     """
     Get recommendation settings for the user.
@@ -280,7 +332,11 @@ def clear_viewing_history(request):
 
     Deletes all viewing history entries for the authenticated user.
     """
-    deleted_count, _ = ViewingHistory.objects.filter(user=request.user).delete()
+    # Issue a single DELETE without loading rows into Python. ViewingHistory
+    # has no dependent foreign keys or delete signal receivers; if either is
+    # ever added, switch back to queryset.delete() so they are honoured.
+    queryset = ViewingHistory.objects.filter(user=request.user)
+    deleted_count = queryset._raw_delete(queryset.db)
 
     return Response(
         {
@@ -300,18 +356,16 @@ def reset_preferences(request):
     """
     preference, created = UserPreference.objects.get_or_create(user=request.user)
 
-    # Reset to defaults
-    preference.genres.clear()
-    preference.avoid_genres.clear()
-    preference.preferred_decades = ""
-    preference.min_rating = None
-    preference.max_runtime = None
-    preference.preferred_languages = ""
-    preference.include_foreign_films = True
-    preference.recommendation_frequency = "weekly"
-    preference.enable_email_recommendations = False
-    preference.include_adult_content = False
-    preference.save()
+    # Reset to defaults: clear genre relations and reset scalar fields with a
+    # single UPDATE (auto_now is not applied by queryset.update()).
+    defaults = {**PREFERENCE_DEFAULTS, "updated_at": timezone.now()}
+    with transaction.atomic():
+        preference.genres.clear()
+        preference.avoid_genres.clear()
+        UserPreference.objects.filter(pk=preference.pk).update(**defaults)
+    for attr, value in defaults.items():
+        setattr(preference, attr, value)
+    preference.clear_memoized_properties()
 
     serializer = UserPreferenceSerializer(preference)
     return Response(
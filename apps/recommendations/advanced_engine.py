@@ -8,12 +8,25 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Max
 from django.utils import timezone
 from datetime import timedelta
 from collections import defaultdict
+from dataclasses import dataclass
+import hashlib
+import heapq
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left
+from functools import lru_cache
 
-from utils.tmdb_client import TMDbClient
+from celery.result import EagerResult
+
+from utils.tmdb_client import get_tmdb_client
+from .basic_engine import BasicRecommendationEngine, recommendation_cache_version
 from .models import (
     SimpleFavorite,
     SimpleViewingHistory,
@@ -28,6 +41,163 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def truncated_svd(matrix, k, n_oversamples=10, n_iter=4, seed=0):
+    """
+    Top-k singular triplets of a matrix via randomized range finding.
+
+    Based on: Halko, N. et al. (2011). Finding Structure with Randomness.
+    Only a thin (k + n_oversamples)-column projection is decomposed, so the
+    cost is O(k·N·M) instead of the full SVD's O(min(N,M)²·max(N,M)). Falls
+    back to the exact SVD when the matrix is too small to benefit.
+    """
+    n_components = k + n_oversamples
+    if n_components >= min(matrix.shape):
+        U, sigma, Vt = np.linalg.svd(matrix, full_matrices=False)
+        return U[:, :k], sigma[:k], Vt[:k, :]
+
+    rng = np.random.default_rng(seed)
+    Q = matrix @ rng.standard_normal((matrix.shape[1], n_components), np.float32)
+
+    # Power iterations sharpen the spectrum of the sampled range
+    for _ in range(n_iter):
+        Q, _ = np.linalg.qr(Q)
+        Q, _ = np.linalg.qr(matrix.T @ Q)
+        Q = matrix @ Q
+    Q, _ = np.linalg.qr(Q)
+
+    U_small, sigma, Vt = np.linalg.svd(Q.T @ matrix, full_matrices=False)
+    U = Q @ U_small
+    return U[:, :k], sigma[:k], Vt[:k, :]
+
+
+class ItemEmbeddingStore:
+    """
+    Process-wide item embeddings kept in one contiguous int8 matrix.
+
+    Rows are generated once per movie id and reused across requests, so
+    scoring a batch of candidates is a row gather plus a single GEMV. Rows
+    are stored with symmetric per-row int8 quantization (a quarter of the
+    float32 footprint) and dequantized to float32 when gathered.
+
+    The matrix grows by doubling its capacity. Once it would hold more than
+    ``max_rows`` rows it is rebuilt with only the batch being looked up;
+    rows are deterministic per movie id, so evicted ones are regenerated
+    unchanged when next needed.
+    """
+
+    INITIAL_CAPACITY = 1024
+    MAX_ROWS = 100_000  # About 5 MB of int8 rows at 50 dimensions
+
+    def __init__(self, embedding_dim=50, max_rows=MAX_ROWS):
+        self.embedding_dim = embedding_dim
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._clear()
+
+    def lookup(self, movie_ids):
+        """Return a (len(movie_ids), embedding_dim) float32 array of embeddings"""
+        with self._lock:
+            unique_ids = dict.fromkeys(movie_ids)
+            missing = [
+                movie_id for movie_id in unique_ids if movie_id not in self._id_to_row
+            ]
+            if missing:
+                if self._size + len(missing) > self.max_rows:
+                    self._clear()
+                    missing = list(unique_ids)
+                self._append(missing)
+            rows = [self._id_to_row[movie_id] for movie_id in movie_ids]
+            return self._quantized[rows] * self._scales[rows, None]
+
+    def _clear(self):
+        """Drop every row, keeping no preallocated capacity"""
+        self._quantized = np.empty((0, self.embedding_dim), dtype=np.int8)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._id_to_row = {}
+        self._size = 0
+
+    def _reserve(self, size):
+        """Grow the preallocated matrix to hold at least size rows"""
+        capacity = len(self._scales)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, self.INITIAL_CAPACITY)
+        quantized = np.empty((capacity, self.embedding_dim), dtype=np.int8)
+        scales = np.empty(capacity, dtype=np.float32)
+        quantized[: self._size] = self._quantized[: self._size]
+        scales[: self._size] = self._scales[: self._size]
+        self._quantized, self._scales = quantized, scales
+
+    def _append(self, movie_ids):
+        """Generate and L2-normalize embeddings for new movie ids"""
+        # Simulate item embeddings based on movie id (consistent per movie)
+        block = 0.1 * np.stack(
+            [
+                np.random.default_rng(movie_id).standard_normal(
+                    self.embedding_dim, dtype=np.float32
+                )
+                for movie_id in movie_ids
+            ]
+        )
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block, norms, out=block, where=norms > 0)
+
+        # Symmetric per-row quantization: row ~= quantized * scale
+        scales = np.abs(block).max(axis=1) / 127
+        scales[scales == 0] = 1
+        quantized = np.round(block / scales[:, None]).astype(np.int8)
+
+        offset = self._size
+        self._reserve(offset + len(movie_ids))
+        self._size += len(movie_ids)
+        self._quantized[offset : self._size] = quantized
+        self._scales[offset : self._size] = scales
+        for row, movie_id in enumerate(movie_ids, start=offset):
+            self._id_to_row[movie_id] = row
+
+
+item_embedding_store = ItemEmbeddingStore()
+
+
+@lru_cache(maxsize=None)
+def ncf_mlp_weights(input_dim):
+    """
+    Fixed NCF MLP weights (would normally be learned), generated once per
+    process and shared by every engine, so they are read-only.
+    """
+    rng = np.random.default_rng(0)
+    # Contiguous float32 buffers so the batched layers run as sgemm
+    weights = (
+        0.1 * rng.standard_normal((input_dim, 64), dtype=np.float32),
+        0.1 * rng.standard_normal((64, 32), dtype=np.float32),
+        0.1 * rng.standard_normal(32, dtype=np.float32),
+    )
+    for weight in weights:
+        weight.setflags(write=False)
+    return weights
+
+
+@dataclass
+class UserContext:
+    """A user's interactions, loaded once per recommendation request"""
+
+    favorite_ids: List[int]
+    history_ids: List[int]  # Most recent first
+    force_refresh: bool = False  # Bypass cached sub-algorithm results
+
+    @property
+    def favorite_count(self):
+        return len(self.favorite_ids)
+
+    @property
+    def history_count(self):
+        return len(self.history_ids)
+
+    @property
+    def has_interactions(self):
+        return bool(self.favorite_ids or self.history_ids)
+
+
 class AdvancedRecommendationEngine:
     """
     Advanced recommendation engine implementing sophisticated algorithms:
@@ -41,8 +211,25 @@ class AdvancedRecommendationEngine:
     7. Deep Learning Feature Embeddings
     """
 
+    CACHE_TIMEOUT = 15 * 60  # 15 minutes
+    PRECOMPUTED_CACHE_TIMEOUT = 24 * 60 * 60  # 24 hours
+    PRECOMPUTE_LIMIT = 50
+    PENDING_TIMEOUT = 5 * 60  # How long a queued computation suppresses requeueing
+    FACTORS_CACHE_TIMEOUT = 24 * 60 * 60  # 24 hours
+
     def __init__(self):
-        self.tmdb_client = TMDbClient()
+        self.tmdb_client = get_tmdb_client()
+        self._movie_data = {}
+        self._candidate_movies = None
+        self._cache_versions = {}
+        # Type of the recommendations last served when it differs from the
+        # requested one, e.g. trending while a computation is queued
+        self.served_type = None
+        self.item_embeddings = item_embedding_store
+
+        self._mlp_w1, self._mlp_w2, self._mlp_w3 = ncf_mlp_weights(
+            2 * item_embedding_store.embedding_dim
+        )
         self.user_item_matrix = None
         self.item_features_matrix = None
         self.user_similarity_matrix = None
@@ -53,6 +240,7 @@ class AdvancedRecommendationEngine:
     ):
         """Enhanced recommendation system with multiple algorithms"""
 
+        self.served_type = None
         try:
             # Check cache first
             if not force_refresh:
@@ -62,94 +250,155 @@ class AdvancedRecommendationEngine:
                 if cached_recs:
                     return cached_recs
 
-            # Get user settings
-            settings = self._get_user_settings(user)
+                # Compute in the background instead of blocking the request
+                interim_recs = self._queue_precompute(user, recommendation_type, limit)
+                if interim_recs is not None:
+                    return interim_recs
 
-            # Choose algorithm based on type
-            if recommendation_type == "matrix_factorization":
-                recommendations = self._matrix_factorization_recommendations(
-                    user, limit, settings
-                )
-            elif recommendation_type == "neural_cf":
-                recommendations = self._neural_collaborative_filtering(
-                    user, limit, settings
-                )
-            elif recommendation_type == "content_based_advanced":
-                recommendations = self._advanced_content_based(user, limit, settings)
-            elif recommendation_type == "collaborative_knn":
-                recommendations = self._collaborative_knn_recommendations(
-                    user, limit, settings
-                )
-            elif recommendation_type == "sequential":
-                recommendations = self._sequential_recommendations(
-                    user, limit, settings
-                )
-            elif recommendation_type == "ensemble":
-                recommendations = self._ensemble_recommendations(user, limit, settings)
-            else:  # hybrid
-                recommendations = self._advanced_hybrid_recommendations(
-                    user, limit, settings
-                )
+            recommendations = self._compute_recommendations(
+                user, recommendation_type, limit, force_refresh
+            )
 
             # Cache results
-            self._cache_recommendations(user, recommendation_type, recommendations)
+            self._cache_recommendations(
+                user, recommendation_type, limit, recommendations
+            )
 
             return recommendations
 
         except Exception as e:
             logger.error(f"Error generating advanced recommendations: {e}")
+            self.served_type = "trending"
             return self._get_fallback_recommendations(limit)
 
-    def _matrix_factorization_recommendations(self, user, limit=20, settings=None):
+    def precompute_recommendations(
+        self, user, recommendation_type="hybrid", limit=PRECOMPUTE_LIMIT
+    ):
+        """Compute recommendations and cache them for background refreshes"""
+        # Read the version before computing, so results computed from data
+        # that changes meanwhile are stored under the superseded version
+        self._cache_version(user)
+        try:
+            recommendations = self._compute_recommendations(
+                user, recommendation_type, limit, force_refresh=True
+            )
+        finally:
+            cache.delete(self._pending_key(user, recommendation_type, limit))
+
+        self._cache_recommendations(
+            user,
+            recommendation_type,
+            limit,
+            recommendations,
+            self.PRECOMPUTED_CACHE_TIMEOUT,
+        )
+        return recommendations
+
+    def _compute_recommendations(self, user, recommendation_type, limit, force_refresh):
+        """Run the requested algorithm synchronously"""
+        # Get user settings
+        settings = self._get_user_settings(user)
+
+        # Load the user's interactions once for every algorithm
+        ctx = self._load_user_interactions(user)
+        ctx.force_refresh = force_refresh
+
+        # Choose algorithm based on type
+        return self._algorithm(recommendation_type)(user, limit, settings, ctx)
+
+    def _queue_precompute(self, user, recommendation_type, limit):
+        """
+        Queue background computation after a cache miss
+
+        Returns the recommendations to serve meanwhile, or None when the task
+        could not be queued and the caller should compute synchronously.
+        Trending movies served meanwhile are marked through served_type.
+        """
+        from .tasks import precompute_recommendations
+
+        pending_key = self._pending_key(user, recommendation_type, limit)
+        if not cache.add(pending_key, True, self.PENDING_TIMEOUT):
+            # Already queued by an earlier request
+            return self._get_interim_recommendations(limit)
+
+        try:
+            # Fail fast instead of retrying while the broker is unreachable
+            result = precompute_recommendations.apply_async(
+                (user.id, recommendation_type, limit), retry=False
+            )
+        except Exception as e:
+            cache.delete(pending_key)
+            logger.warning(f"Could not queue recommendation precompute: {e}")
+            return None
+
+        if isinstance(result, EagerResult):
+            # Ran inline (CELERY_TASK_ALWAYS_EAGER); a queued task's result is
+            # never stored, so it is not polled
+            return result.result if result.successful() else None
+        return self._get_interim_recommendations(limit)
+
+    def _get_interim_recommendations(self, limit):
+        """Trending movies served while a user's recommendations are computed"""
+        self.served_type = "trending"
+        return self._get_trending_recommendations(limit)
+
+    def _algorithm(self, recommendation_type):
+        """Resolve a recommendation type to the method implementing it"""
+        return {
+            "matrix_factorization": self._matrix_factorization_recommendations,
+            "neural_cf": self._neural_collaborative_filtering,
+            "content_based_advanced": self._advanced_content_based,
+            "collaborative_knn": self._collaborative_knn_recommendations,
+            "sequential": self._sequential_recommendations,
+            "ensemble": self._ensemble_recommendations,
+        }.get(recommendation_type, self._advanced_hybrid_recommendations)
+
+    def _matrix_factorization_recommendations(
+        self, user, limit=20, settings=None, ctx=None
+    ):
         """
         Matrix Factorization using SVD-like approach
         Based on: Koren, Y. (2009). Matrix Factorization Techniques for Recommender Systems
         """
         try:
-            # Get user-item interaction matrix
-            matrix_data = self._build_user_item_matrix()
-            if not matrix_data:
+            # Get factors of the user-item interaction matrix
+            factors = self._get_matrix_factors()
+            if not factors:
                 return self._get_trending_recommendations(limit)
 
-            user_movie_matrix, user_ids, movie_ids = matrix_data
+            user_factors, Vt, user_ids, movie_ids = factors
 
-            if user.id not in user_ids:
+            user_idx = self._find_index(user_ids, user.id)
+            if user_idx is None:
                 return self._get_trending_recommendations(limit)
 
-            user_idx = user_ids.index(user.id)
-
-            # Simple SVD-based matrix factorization
-            # In practice, you'd use libraries like scikit-learn or surprise
-            k_factors = min(50, min(user_movie_matrix.shape) - 1)
-            U, sigma, Vt = np.linalg.svd(user_movie_matrix, full_matrices=False)
-
-            # Reconstruct with k factors
-            U_k = U[:, :k_factors]
-            sigma_k = np.diag(sigma[:k_factors])
-            Vt_k = Vt[:k_factors, :]
-
-            # Predict ratings for user
-            user_vector = U_k[user_idx, :] @ sigma_k
-            predicted_ratings = user_vector @ Vt_k
+            # Predict ratings for the requested user only
+            predicted_ratings = user_factors[user_idx] @ Vt
 
-            # Get top recommendations
-            user_rated_indices = np.where(user_movie_matrix[user_idx, :] > 0)[0]
-            predicted_ratings[user_rated_indices] = -np.inf  # Exclude already rated
+            # Get top recommendations, excluding already rated movies
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
+            for movie_id in set(ctx.favorite_ids) | set(ctx.history_ids):
+                movie_idx = self._find_index(movie_ids, movie_id)
+                if movie_idx is not None:
+                    predicted_ratings[movie_idx] = -np.inf
+            top_indices = self._top_k_indices(predicted_ratings, limit)
 
-            top_indices = np.argsort(predicted_ratings)[::-1][:limit]
+            top_indices = [
+                idx for idx in top_indices if predicted_ratings[idx] > -np.inf
+            ]
+            # Load details for all top movies in one batch
+            details = self._get_movie_data_bulk([movie_ids[idx] for idx in top_indices])
 
             recommendations = []
             for idx in top_indices:
-                if idx < len(movie_ids):
-                    movie_id = movie_ids[idx]
-                    score = predicted_ratings[idx]
-                    movie_data = self._get_movie_data(movie_id)
-                    if movie_data:
-                        movie_data["recommendation_score"] = float(score)
-                        movie_data["recommendation_reason"] = (
-                            "Matrix factorization based on user preferences"
-                        )
-                        recommendations.append(movie_data)
+                movie_data = details.get(movie_ids[idx])
+                if movie_data:
+                    movie_data["recommendation_score"] = float(predicted_ratings[idx])
+                    movie_data["recommendation_reason"] = (
+                        "Matrix factorization based on user preferences"
+                    )
+                    recommendations.append(movie_data)
 
             return recommendations[:limit]
 
@@ -157,7 +406,7 @@ class AdvancedRecommendationEngine:
             logger.error(f"Matrix factorization error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _neural_collaborative_filtering(self, user, limit=20, settings=None):
+    def _neural_collaborative_filtering(self, user, limit=20, settings=None, ctx=None):
         """
         Neural Collaborative Filtering approach
         Based on: He, X. et al. (2017). Neural Collaborative Filtering
@@ -166,50 +415,57 @@ class AdvancedRecommendationEngine:
         """
         try:
             # Get user interactions
-            user_favorites = list(
-                SimpleFavorite.objects.filter(user=user).values_list(
-                    "movie_id", flat=True
-                )
-            )
-            user_history = list(
-                SimpleViewingHistory.objects.filter(user=user).values_list(
-                    "movie_id", flat=True
-                )
-            )
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
 
-            if not user_favorites and not user_history:
+            if not ctx.has_interactions:
                 return self._get_trending_recommendations(limit)
 
             # Simulate user and item embeddings (normally learned through neural networks)
-            user_embedding = self._generate_user_embedding(user)
+            user_embedding = self._generate_user_embedding(user, ctx)
 
             # Get candidate movies
-            candidate_movies = self._get_candidate_movies(user, limit * 3)
-
-            recommendations = []
-            for movie in candidate_movies:
-                try:
-                    item_embedding = self._generate_item_embedding(movie["id"])
+            candidate_movies = [
+                movie
+                for movie in self._get_candidate_movies(user, limit * 3)
+                if movie.get("id")
+            ]
+            if not candidate_movies:
+                return []
 
-                    # Simulate neural network interaction
-                    # GMF (Generalized Matrix Factorization) component
-                    gmf_score = np.dot(user_embedding, item_embedding)
+            # GMF (Generalized Matrix Factorization) component, scored for
+            # every candidate at once
+            item_embeddings = self.item_embeddings.lookup(
+                [movie["id"] for movie in candidate_movies]
+            )
+            gmf_scores = item_embeddings @ user_embedding
 
-                    # MLP (Multi-Layer Perceptron) component
-                    mlp_input = np.concatenate([user_embedding, item_embedding])
-                    mlp_score = self._simulate_mlp(mlp_input)
+            # Shortlist by GMF inner product so the MLP only reranks the
+            # most promising candidates
+            shortlist_size = min(len(candidate_movies), limit * 2)
+            shortlist = np.argpartition(-gmf_scores, shortlist_size - 1)[
+                :shortlist_size
+            ]
 
-                    # NeuMF (Neural Matrix Factorization) - combine both
-                    final_score = 0.5 * gmf_score + 0.5 * mlp_score
+            # MLP (Multi-Layer Perceptron) component, one batch for the
+            # whole shortlist
+            embedding_dim = len(user_embedding)
+            mlp_inputs = np.empty((shortlist_size, 2 * embedding_dim), np.float32)
+            mlp_inputs[:, :embedding_dim] = user_embedding
+            mlp_inputs[:, embedding_dim:] = item_embeddings[shortlist]
+            mlp_scores = self._mlp_batch(mlp_inputs)
 
-                    movie["recommendation_score"] = float(final_score)
-                    movie["recommendation_reason"] = (
-                        "Neural collaborative filtering with deep embeddings"
-                    )
-                    recommendations.append(movie)
+            # NeuMF (Neural Matrix Factorization) - combine both
+            final_scores = 0.5 * gmf_scores[shortlist] + 0.5 * mlp_scores
 
-                except Exception as e:
-                    continue
+            recommendations = []
+            for idx, final_score in zip(shortlist, final_scores):
+                movie = candidate_movies[idx]
+                movie["recommendation_score"] = float(final_score)
+                movie["recommendation_reason"] = (
+                    "Neural collaborative filtering with deep embeddings"
+                )
+                recommendations.append(movie)
 
             # Sort by score and return top results
             recommendations.sort(
@@ -221,21 +477,17 @@ class AdvancedRecommendationEngine:
             logger.error(f"Neural CF error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _advanced_content_based(self, user, limit=20, settings=None):
+    def _advanced_content_based(self, user, limit=20, settings=None, ctx=None):
         """
         Advanced Content-Based Filtering using TF-IDF and Cosine Similarity
         Enhanced with genre preferences, cast, director, and keyword analysis
         """
         try:
             # Get user's interaction history
-            user_favorites = SimpleFavorite.objects.filter(user=user).values_list(
-                "movie_id", flat=True
-            )
-            user_history = SimpleViewingHistory.objects.filter(user=user).values_list(
-                "movie_id", flat=True
-            )
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
 
-            if not user_favorites and not user_history:
+            if not ctx.has_interactions:
                 return self._get_trending_recommendations(limit)
 
             # Build user profile from interactions
@@ -244,11 +496,15 @@ class AdvancedRecommendationEngine:
             # Get candidate movies
             candidate_movies = self._get_candidate_movies(user, limit * 5)
 
+            # Get detailed movie information for every candidate at once
+            details = self._get_movie_data_bulk(
+                [movie["id"] for movie in candidate_movies]
+            )
+
             recommendations = []
             for movie in candidate_movies:
                 try:
-                    # Get detailed movie information
-                    movie_details = self.tmdb_client.get_movie_details(movie["id"])
+                    movie_details = details[movie["id"]]
 
                     # Calculate content similarity
                     content_score = self._calculate_content_similarity(
@@ -257,7 +513,7 @@ class AdvancedRecommendationEngine:
 
                     # Genre preference score
                     genre_score = self._calculate_genre_preference_score(
-                        user, movie_details.get("genres", [])
+                        user, movie_details["genre_ids"]
                     )
 
                     # Popularity and quality score
@@ -287,7 +543,9 @@ class AdvancedRecommendationEngine:
             logger.error(f"Advanced content-based error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _collaborative_knn_recommendations(self, user, limit=20, settings=None):
+    def _collaborative_knn_recommendations(
+        self, user, limit=20, settings=None, ctx=None
+    ):
         """
         K-Nearest Neighbors Collaborative Filtering
         Both user-based and item-based approaches
@@ -300,11 +558,10 @@ class AdvancedRecommendationEngine:
 
             user_movie_matrix, user_ids, movie_ids = matrix_data
 
-            if user.id not in user_ids:
+            user_idx = self._find_index(user_ids, user.id)
+            if user_idx is None:
                 return self._get_trending_recommendations(limit)
 
-            user_idx = user_ids.index(user.id)
-
             # User-based collaborative filtering
             user_similarities = self._calculate_user_similarities(
                 user_movie_matrix, user_idx
@@ -314,7 +571,9 @@ class AdvancedRecommendationEngine:
             )
 
             # Item-based collaborative filtering
-            item_similarities = self._calculate_item_similarities(user_movie_matrix)
+            item_similarities = self._calculate_item_similarities(
+                user_movie_matrix, user_idx
+            )
             item_based_recs = self._item_based_recommendations(
                 user_movie_matrix, item_similarities, user_idx, movie_ids, limit
             )
@@ -330,31 +589,31 @@ class AdvancedRecommendationEngine:
             logger.error(f"KNN collaborative filtering error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _sequential_recommendations(self, user, limit=20, settings=None):
+    def _sequential_recommendations(self, user, limit=20, settings=None, ctx=None):
         """
         Sequential/Session-based Recommendations
         Based on viewing patterns and temporal dynamics
         """
         try:
-            # Get user's viewing history in chronological order
-            history = SimpleViewingHistory.objects.filter(user=user).order_by(
-                "-created_at"
-            )[:10]
+            # Get user's viewing history, most recent first
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
 
-            if not history:
-                return self._get_trending_recommendations(limit)
+            recent_movies = ctx.history_ids[:10]
 
-            recent_movies = [h.movie_id for h in history]
+            if not recent_movies:
+                return self._get_trending_recommendations(limit)
 
             # Find sequential patterns and similar movie sequences
             sequence_recommendations = []
 
-            for movie_id in recent_movies[:3]:  # Focus on 3 most recent
+            # Focus on 3 most recent
+            for position, movie_id in enumerate(recent_movies[:3]):
                 # Get movies similar to this one
                 similar_movies = self._get_similar_movies_to_id(movie_id, limit=10)
 
                 # Calculate temporal decay (more recent interactions have higher weight)
-                position_weight = 1.0 / (recent_movies.index(movie_id) + 1)
+                position_weight = 1.0 / (position + 1)
 
                 for movie in similar_movies:
                     movie["recommendation_score"] = (
@@ -365,11 +624,11 @@ class AdvancedRecommendationEngine:
                     )
                     sequence_recommendations.append(movie)
 
-            # Remove duplicates and sort
-            seen_ids = set()
+            # Remove duplicates and already watched movies, then sort
+            seen_ids = set(recent_movies)
             unique_recs = []
             for movie in sequence_recommendations:
-                if movie["id"] not in seen_ids and movie["id"] not in recent_movies:
+                if movie["id"] not in seen_ids:
                     seen_ids.add(movie["id"])
                     unique_recs.append(movie)
 
@@ -382,7 +641,7 @@ class AdvancedRecommendationEngine:
             logger.error(f"Sequential recommendations error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _ensemble_recommendations(self, user, limit=20, settings=None):
+    def _ensemble_recommendations(self, user, limit=20, settings=None, ctx=None):
         """
         Ensemble method combining multiple algorithms
         Uses weighted voting from different recommendation strategies
@@ -397,15 +656,53 @@ class AdvancedRecommendationEngine:
                 ("neural_cf", 0.15),
             ]
 
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
+
+            # Fetch every sub-algorithm's cached results in one round trip
+            cache_keys = {
+                algo_name: self._cache_key(user, algo_name, limit * 2)
+                for algo_name, _ in algorithms
+            }
+            cached = {} if ctx.force_refresh else cache.get_many(cache_keys.values())
+            results = {
+                algo_name: cached[key]
+                for algo_name, key in cache_keys.items()
+                if key in cached
+            }
+
+            # Compute the misses concurrently; they mostly wait on TMDb I/O
+            missing = [
+                algo_name for algo_name, _ in algorithms if algo_name not in results
+            ]
+            computed = {}
+            if missing:
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    futures = {
+                        algo_name: executor.submit(
+                            self._run_in_thread,
+                            self._algorithm(algo_name),
+                            user,
+                            limit * 2,
+                            settings,
+                            ctx,
+                        )
+                        for algo_name in missing
+                    }
+                for algo_name, future in futures.items():
+                    try:
+                        results[algo_name] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Algorithm {algo_name} failed in ensemble: {e}")
+                        continue
+                    if results[algo_name]:
+                        computed[cache_keys[algo_name]] = results[algo_name]
+
             all_recommendations = {}
 
             for algo_name, weight in algorithms:
                 try:
-                    recs = self.get_recommendations(
-                        user, algo_name, limit * 2, force_refresh=True
-                    )
-
-                    for movie in recs:
+                    for movie in results.get(algo_name, []):
                         movie_id = movie["id"]
                         score = movie.get("recommendation_score", 0.5) * weight
 
@@ -424,14 +721,18 @@ class AdvancedRecommendationEngine:
                     logger.warning(f"Algorithm {algo_name} failed in ensemble: {e}")
                     continue
 
-            # Sort by combined score
-            sorted_recs = sorted(
-                all_recommendations.items(), key=lambda x: x[1]["score"], reverse=True
+            # Store before the final scores below are written onto the movies
+            if computed:
+                cache.set_many(computed, self.CACHE_TIMEOUT)
+
+            # Select the top combined scores
+            top_recs = heapq.nlargest(
+                limit, all_recommendations.items(), key=lambda x: x[1]["score"]
             )
 
             # Prepare final recommendations
             recommendations = []
-            for movie_id, data in sorted_recs[:limit]:
+            for movie_id, data in top_recs:
                 movie = data["movie"]
                 movie["recommendation_score"] = data["score"]
                 movie["recommendation_reason"] = (
@@ -445,14 +746,16 @@ class AdvancedRecommendationEngine:
             logger.error(f"Ensemble recommendations error: {e}")
             return self._get_trending_recommendations(limit)
 
-    def _advanced_hybrid_recommendations(self, user, limit=20, settings=None):
+    def _advanced_hybrid_recommendations(self, user, limit=20, settings=None, ctx=None):
         """
         Advanced hybrid approach with dynamic weighting based on user data availability
         """
         try:
             # Analyze user data to determine best approach
-            user_favorites_count = SimpleFavorite.objects.filter(user=user).count()
-            user_history_count = SimpleViewingHistory.objects.filter(user=user).count()
+            if ctx is None:
+                ctx = self._load_user_interactions(user)
+            user_favorites_count = ctx.favorite_count
+            user_history_count = ctx.history_count
 
             # Dynamic weighting based on data availability
             if user_favorites_count < 3 and user_history_count < 5:
@@ -487,8 +790,8 @@ class AdvancedRecommendationEngine:
                     if algo_name == "trending":
                         recs = self._get_trending_recommendations(limit * 2)
                     else:
-                        recs = getattr(self, f"_{algo_name}_recommendations")(
-                            user, limit * 2, settings
+                        recs = self._algorithm(algo_name)(
+                            user, limit * 2, settings, ctx
                         )
 
                     for movie in recs:
@@ -506,15 +809,13 @@ class AdvancedRecommendationEngine:
                     logger.warning(f"Algorithm {algo_name} failed in hybrid: {e}")
                     continue
 
-            # Sort and return
-            sorted_recs = sorted(
-                combined_recommendations.items(),
-                key=lambda x: x[1]["score"],
-                reverse=True,
+            # Select the top combined scores and return
+            top_recs = heapq.nlargest(
+                limit, combined_recommendations.items(), key=lambda x: x[1]["score"]
             )
 
             recommendations = []
-            for movie_id, data in sorted_recs[:limit]:
+            for movie_id, data in top_recs:
                 movie = data["movie"]
                 movie["recommendation_score"] = data["score"]
                 movie["recommendation_reason"] = (
@@ -532,34 +833,34 @@ class AdvancedRecommendationEngine:
     def _build_user_item_matrix(self):
         """Build user-item interaction matrix"""
         try:
-            # Get all user interactions
-            favorites = SimpleFavorite.objects.all().values("user_id", "movie_id")
-            history = SimpleViewingHistory.objects.all().values("user_id", "movie_id")
-
-            # Combine interactions
-            interactions = {}
-            for fav in favorites:
-                user_id, movie_id = fav["user_id"], fav["movie_id"]
-                interactions[(user_id, movie_id)] = 1.0
+            # Get all user interactions as (user_id, movie_id) tuples
+            favorites = SimpleFavorite.objects.values_list("user_id", "movie_id")
+            history = SimpleViewingHistory.objects.values_list("user_id", "movie_id")
 
-            for hist in history:
-                user_id, movie_id = hist["user_id"], hist["movie_id"]
-                if (user_id, movie_id) not in interactions:
-                    interactions[(user_id, movie_id)] = 0.8
+            # Combine interactions; a favorite outweighs a plain view
+            interactions = dict.fromkeys(history, 0.8)
+            interactions.update(dict.fromkeys(favorites, 1.0))
 
             if not interactions:
                 return None
 
             # Create matrix
-            user_ids = sorted(list(set([uid for uid, _ in interactions.keys()])))
-            movie_ids = sorted(list(set([mid for _, mid in interactions.keys()])))
-
-            matrix = np.zeros((len(user_ids), len(movie_ids)))
+            user_ids = sorted({uid for uid, _ in interactions})
+            movie_ids = sorted({mid for _, mid in interactions})
+            user_index = {uid: idx for idx, uid in enumerate(user_ids)}
+            movie_index = {mid: idx for idx, mid in enumerate(movie_ids)}
+
+            count = len(interactions)
+            rows = np.fromiter(
+                (user_index[uid] for uid, _ in interactions), np.int32, count
+            )
+            cols = np.fromiter(
+                (movie_index[mid] for _, mid in interactions), np.int32, count
+            )
+            values = np.fromiter(interactions.values(), np.float32, count)
 
-            for (user_id, movie_id), rating in interactions.items():
-                user_idx = user_ids.index(user_id)
-                movie_idx = movie_ids.index(movie_id)
-                matrix[user_idx, movie_idx] = rating
+            matrix = np.zeros((len(user_ids), len(movie_ids)), dtype=np.float32)
+            matrix[rows, cols] = values
 
             return matrix, user_ids, movie_ids
 
@@ -567,50 +868,101 @@ class AdvancedRecommendationEngine:
             logger.error(f"Error building user-item matrix: {e}")
             return None
 
-    def _generate_user_embedding(self, user, embedding_dim=50):
+    def _get_matrix_factors(self):
+        """
+        Truncated SVD factors of the user-item interaction matrix
+
+        Returns (U * sigma, Vt, user_ids, movie_ids), cached under a version
+        derived from the interaction tables so factors are only recomputed
+        after favorites or viewing history change. Singular values are folded
+        into the user factors once, so a prediction is a single GEMV.
+        """
+        cache_key = f"recs:mf_user_factors:{self._interactions_version()}"
+        factors = cache.get(cache_key)
+        if factors is None:
+            matrix_data = self._build_user_item_matrix()
+            if not matrix_data:
+                return None
+
+            user_movie_matrix, user_ids, movie_ids = matrix_data
+
+            # Truncated SVD: only the top-k singular triplets are computed
+            k_factors = min(50, min(user_movie_matrix.shape) - 1)
+            U, sigma, Vt = truncated_svd(user_movie_matrix, k_factors)
+
+            U *= sigma
+            factors = (U, Vt, user_ids, movie_ids)
+            cache.set(cache_key, factors, self.FACTORS_CACHE_TIMEOUT)
+        return factors
+
+    def _interactions_version(self):
+        """Fingerprint of the interaction tables (row counts and latest rows)"""
+        favorites = SimpleFavorite.objects.aggregate(
+            count=Count("id"), latest=Max("created_at")
+        )
+        history = SimpleViewingHistory.objects.aggregate(
+            count=Count("id"), latest=Max("created_at")
+        )
+        fingerprint = (
+            f"{favorites['count']}:{favorites['latest']}:"
+            f"{history['count']}:{history['latest']}"
+        )
+        return hashlib.md5(fingerprint.encode()).hexdigest()
+
+    @staticmethod
+    def _find_index(sorted_ids, target_id):
+        """Position of target_id in a sorted id list, or None if absent"""
+        idx = bisect_left(sorted_ids, target_id)
+        if idx < len(sorted_ids) and sorted_ids[idx] == target_id:
+            return idx
+        return None
+
+    def _load_user_interactions(self, user):
+        """Load the user's favorite and viewing history movie ids"""
+        return UserContext(
+            favorite_ids=list(
+                SimpleFavorite.objects.filter(user=user).values_list(
+                    "movie_id", flat=True
+                )
+            ),
+            history_ids=list(
+                SimpleViewingHistory.objects.filter(user=user)
+                .order_by("-created_at")
+                .values_list("movie_id", flat=True)
+            ),
+        )
+
+    def _generate_user_embedding(self, user, ctx, embedding_dim=50):
         """Generate user embedding vector"""
         # In practice, this would be learned through neural networks
         # Here we simulate based on user preferences
-        np.random.seed(user.id)  # Consistent embeddings
-        base_embedding = np.random.normal(0, 0.1, embedding_dim)
+        rng = np.random.default_rng(user.id)  # Consistent embeddings
+        base_embedding = 0.1 * rng.standard_normal(embedding_dim, dtype=np.float32)
 
         # Adjust based on user favorites
-        favorites = SimpleFavorite.objects.filter(user=user)[:10]
-        for fav in favorites:
-            # Add some deterministic adjustment based on movie properties
-            movie_influence = np.random.normal(0, 0.05, embedding_dim)
-            base_embedding += movie_influence
+        # Add some deterministic adjustment based on movie properties
+        movie_influences = rng.standard_normal(
+            (min(ctx.favorite_count, 10), embedding_dim), dtype=np.float32
+        )
+        base_embedding += 0.05 * movie_influences.sum(axis=0)
 
         # Normalize
-        norm = np.linalg.norm(base_embedding)
-        return base_embedding / norm if norm > 0 else base_embedding
-
-    def _generate_item_embedding(self, movie_id, embedding_dim=50):
-        """Generate item embedding vector"""
-        # Simulate item embedding based on movie properties
-        np.random.seed(movie_id)  # Consistent embeddings
-        embedding = np.random.normal(0, 0.1, embedding_dim)
-
-        # Normalize
-        norm = np.linalg.norm(embedding)
-        return embedding / norm if norm > 0 else embedding
-
-    def _simulate_mlp(self, input_vector):
-        """Simulate MLP component of NCF"""
-        # Simple simulation of multi-layer perceptron
-        # Layer 1
-        w1 = np.random.normal(0, 0.1, (len(input_vector), 64))
-        h1 = np.maximum(0, np.dot(input_vector, w1))  # ReLU
-
-        # Layer 2
-        w2 = np.random.normal(0, 0.1, (64, 32))
-        h2 = np.maximum(0, np.dot(h1, w2))  # ReLU
-
-        # Output layer
-        w3 = np.random.normal(0, 0.1, 32)
-        output = np.dot(h2, w3)
-
-        return float(output)
+        base_embedding /= max(np.linalg.norm(base_embedding), 1e-12)
+        return base_embedding
+
+    def _generate_item_embedding(self, movie_id):
+        """Get item embedding vector"""
+        return self.item_embeddings.lookup([movie_id])[0]
+
+    def _mlp_batch(self, inputs):
+        """Simulate MLP component of NCF for a (batch, 2 * dim) float32 array"""
+        # Simple simulation of multi-layer perceptron with fixed weights;
+        # ReLU is applied in place on each layer's output
+        h1 = inputs @ self._mlp_w1
+        np.maximum(h1, 0, out=h1)
+        h2 = h1 @ self._mlp_w2
+        np.maximum(h2, 0, out=h2)
+        return h2 @ self._mlp_w3
 
     def _get_trending_recommendations(self, limit=20):
         """Get trending movies as fallback"""
@@ -631,37 +983,103 @@ class AdvancedRecommendationEngine:
         """Fallback to popular movies"""
         return self._get_trending_recommendations(limit)
 
+    @staticmethod
+    def _run_in_thread(func, *args):
+        """Run func in a worker thread, closing that thread's DB connections"""
+        try:
+            return func(*args)
+        finally:
+            connections.close_all()
+
+    def _cache_version(self, user):
+        """
+        Version of the user's cached recommendations, read once per engine
+
+        Shared with the basic engine, so invalidating a user's
+        recommendations covers both.
+        """
+        version = self._cache_versions.get(user.id)
+        if version is None:
+            version = recommendation_cache_version(user.id)
+            self._cache_versions[user.id] = version
+        return version
+
+    def _cache_key(self, user, rec_type, limit):
+        """Cache key for a user's recommendations of one type"""
+        return f"recs:{user.id}:v{self._cache_version(user)}:{rec_type}:{limit}"
+
+    def _pending_key(self, user, rec_type, limit):
+        """Cache key marking a queued background computation"""
+        return f"{self._cache_key(user, rec_type, limit)}:pending"
+
     def _get_cached_recommendations(self, user, rec_type, limit):
-        """Check for cached recommendations"""
-        # Implementation for cache checking
+        """Check for cached recommendations, including precomputed ones"""
+        cache_keys = [self._cache_key(user, rec_type, limit)]
+        if limit < self.PRECOMPUTE_LIMIT:
+            cache_keys.append(self._cache_key(user, rec_type, self.PRECOMPUTE_LIMIT))
+
+        cached = cache.get_many(cache_keys)
+        for cache_key in cache_keys:
+            if cached.get(cache_key):
+                return cached[cache_key][:limit]
         return None
 
-    def _cache_recommendations(self, user, rec_type, recommendations):
+    def _cache_recommendations(
+        self, user, rec_type, limit, recommendations, timeout=None
+    ):
         """Cache recommendations"""
-        # Implementation for caching
-        pass
+        if recommendations:
+            cache.set(
+                self._cache_key(user, rec_type, limit),
+                recommendations,
+                timeout or self.CACHE_TIMEOUT,
+            )
 
     def _get_user_settings(self, user):
         """Get user recommendation settings"""
+        # The reverse one-to-one accessor caches the row on the user instance,
+        # so repeat calls within a request do not query again
         try:
-            return RecommendationSettings.objects.get(user=user)
+            return user.recommendation_settings
         except RecommendationSettings.DoesNotExist:
-            return RecommendationSettings.objects.create(user=user)
+            settings, created = RecommendationSettings.objects.get_or_create(user=user)
+            return settings
 
     def _get_candidate_movies(self, user, limit):
         """Get candidate movies for recommendation"""
-        try:
-            result = self.tmdb_client.get_popular_movies()
-            return result.get("results", [])[:limit]
-        except Exception:
-            return []
+        # Fetched once per engine; copies keep algorithms from sharing dicts
+        if self._candidate_movies is None:
+            try:
+                result = self.tmdb_client.get_popular_movies()
+                self._candidate_movies = result.get("results", [])
+            except Exception:
+                return []
+        return [dict(movie) for movie in self._candidate_movies[:limit]]
+
+    def _get_movie_data_bulk(self, movie_ids):
+        """
+        Get movie data from TMDb for several movies, keyed by movie id
 
-    def _get_movie_data(self, movie_id):
-        """Get movie data from TMDb"""
-        try:
-            return self.tmdb_client.get_movie_details(movie_id)
-        except Exception:
-            return None
+        Details are reduced to the list fields the basic engine serves, so
+        recommendations built from them have genre_ids like list results.
+        """
+        missing = [
+            movie_id for movie_id in movie_ids if movie_id not in self._movie_data
+        ]
+        if missing:
+            try:
+                details = self.tmdb_client.get_movie_details_bulk(missing)
+            except Exception:
+                details = {}
+            self._movie_data.update(
+                (movie_id, BasicRecommendationEngine._movie_summary(movie_details))
+                for movie_id, movie_details in details.items()
+            )
+        return {
+            movie_id: dict(self._movie_data[movie_id])
+            for movie_id in movie_ids
+            if self._movie_data.get(movie_id)
+        }
 
     def _build_user_content_profile(self, user):
         """Build user content profile from interactions"""
@@ -690,32 +1108,97 @@ class AdvancedRecommendationEngine:
 
     def _calculate_user_similarities(self, matrix, user_idx):
         """Calculate user similarities using cosine similarity"""
-        # Placeholder implementation
-        return np.random.random(matrix.shape[0])
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1
+        similarities = matrix @ matrix[user_idx]
+        similarities /= norms
+        similarities /= norms[user_idx]
+        similarities[user_idx] = -1  # Exclude the user themself
+        return similarities
+
+    def _calculate_item_similarities(self, matrix, user_idx):
+        """
+        Calculate cosine similarities between the user's items and all items
 
-    def _calculate_item_similarities(self, matrix):
-        """Calculate item similarities"""
-        # Placeholder implementation
-        return np.random.random((matrix.shape[1], matrix.shape[1]))
+        Only the rows for items the user interacted with are computed, so the
+        result is (n_user_items, n_items) rather than a full item-item matrix.
+        """
+        user_items = np.flatnonzero(matrix[user_idx])
+        norms = np.linalg.norm(matrix, axis=0)
+        norms[norms == 0] = 1
+        similarities = matrix[:, user_items].T @ matrix
+        similarities /= norms[user_items, None]
+        similarities /= norms
+        return similarities
 
     def _user_based_recommendations(
-        self, matrix, similarities, user_idx, movie_ids, limit
+        self, matrix, similarities, user_idx, movie_ids, limit, k_neighbors=20
     ):
-        """Generate user-based recommendations"""
-        # Placeholder implementation
-        return []
+        """Generate user-based recommendations as (movie_id, score) pairs"""
+        k_neighbors = min(k_neighbors, len(similarities) - 1)
+        if k_neighbors < 1:
+            return []
+
+        neighbors = np.argpartition(-similarities, k_neighbors - 1)[:k_neighbors]
+        neighbors = neighbors[similarities[neighbors] > 0]
+        if not len(neighbors):
+            return []
+
+        weights = similarities[neighbors]
+        scores = (weights @ matrix[neighbors]) / weights.sum()
+        return self._top_scored_movies(scores, matrix[user_idx], movie_ids, limit)
 
     def _item_based_recommendations(
         self, matrix, similarities, user_idx, movie_ids, limit
     ):
-        """Generate item-based recommendations"""
-        # Placeholder implementation
-        return []
+        """Generate item-based recommendations as (movie_id, score) pairs"""
+        if not len(similarities):
+            return []
+
+        user_row = matrix[user_idx]
+        ratings = user_row[user_row > 0]
+        weight_sums = np.abs(similarities).sum(axis=0)
+        weight_sums[weight_sums == 0] = 1
+        scores = (ratings @ similarities) / weight_sums
+        return self._top_scored_movies(scores, user_row, movie_ids, limit)
+
+    def _top_scored_movies(self, scores, user_row, movie_ids, limit):
+        """Highest positive scores for movies the user has not interacted with"""
+        scores = np.where(user_row > 0, -np.inf, scores)
+        top = self._top_k_indices(scores, limit)
+        return [(movie_ids[idx], float(scores[idx])) for idx in top if scores[idx] > 0]
+
+    @staticmethod
+    def _top_k_indices(scores, k):
+        """Indices of the k highest scores, best first, in O(n + k log k)"""
+        k = min(k, len(scores))
+        if k < 1:
+            return np.empty(0, dtype=np.intp)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
 
     def _combine_knn_recommendations(self, user_based, item_based, limit):
         """Combine user and item-based recommendations"""
-        # Placeholder implementation
-        return (user_based + item_based)[:limit]
+        combined = defaultdict(float)
+        for movie_id, score in user_based:
+            combined[movie_id] += 0.5 * score
+        for movie_id, score in item_based:
+            combined[movie_id] += 0.5 * score
+
+        top_movies = heapq.nlargest(limit, combined.items(), key=lambda x: x[1])
+        details = self._get_movie_data_bulk([movie_id for movie_id, _ in top_movies])
+
+        recommendations = []
+        for movie_id, score in top_movies:
+            movie_data = details.get(movie_id)
+            if movie_data:
+                movie_data["recommendation_score"] = score
+                movie_data["recommendation_reason"] = (
+                    "Collaborative filtering with similar users and movies"
+                )
+                recommendations.append(movie_data)
+
+        return recommendations
 
     def _get_similar_movies_to_id(self, movie_id, limit=10):
         """Get movies similar to given movie ID"""
@@ -3,46 +3,343 @@ Basic recommendation engine for Phase 7 implementation.
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Dict, List
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 
-from utils.tmdb_client import TMDbClient
+from utils.tmdb_client import get_tmdb_client
 from .models import SimpleFavorite, RecommendationCache, RecommendationSettings
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Recently served recommendations per (user_id, type, limit), so bursts of
+# identical requests skip the database and cache. Bounded LRU with a short TTL.
+RECENT_RECOMMENDATIONS_MAX_SIZE = 1000
+RECENT_RECOMMENDATIONS_TTL = 30  # seconds
+_recent_recommendations: "OrderedDict[tuple, tuple]" = OrderedDict()
+_recent_recommendations_lock = threading.Lock()
+
+
+def recommendation_cache_key(user_id, recommendation_type, version):
+    """Shared cache key mirroring a user's RecommendationCache row"""
+    return f"rec:{user_id}:v{version}:{recommendation_type}"
+
+
+def recommendation_version_key(user_id):
+    """Cache key holding the version of a user's cached recommendations"""
+    return f"rec_ver:{user_id}"
+
+
+def _new_recommendation_version():
+    # Milliseconds rather than 1, so a version recreated after the key is
+    # lost or evicted does not match rows stamped before it
+    return time.time_ns() // 1_000_000
+
+
+def recommendation_cache_version(user_id):
+    """Current version of a user's cached recommendations"""
+    return cache.get_or_set(
+        recommendation_version_key(user_id), _new_recommendation_version, timeout=None
+    )
+
+
+def bump_recommendation_version(user_id):
+    """Move a user to a new version, orphaning the entries cached so far"""
+    key = recommendation_version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version stored yet; a fresh one is newer than any stamped
+        cache.set(key, _new_recommendation_version(), timeout=None)
+
+
+def forget_recent_recommendations(user_id):
+    """Drop this process's recently served recommendations for a user"""
+    with _recent_recommendations_lock:
+        for key in [key for key in _recent_recommendations if key[0] == user_id]:
+            del _recent_recommendations[key]
+
 
 class BasicRecommendationEngine:
     """Basic recommendation engine for Phase 7"""
 
+    STALE_TIMEOUT = timedelta(hours=1)  # How long past refresh_after entries are served
+    REFRESH_PENDING_TIMEOUT = 5 * 60  # How long a queued refresh suppresses requeueing
+
     def __init__(self):
-        self.tmdb_client = TMDbClient()
+        self.tmdb_client = get_tmdb_client()
+        self._movie_lists = {}
+        self._has_favorites = {}
+        self.served_from_cache = False
 
     def get_recommendations(
         self, user, recommendation_type="hybrid", limit=20, force_refresh=False
     ):
         """Get basic recommendations for user"""
 
+        self.served_from_cache = False
+        memo_key = (user.id, recommendation_type, limit)
+        if not force_refresh:
+            recent = self._get_recent_recommendations(memo_key)
+            if recent is not None:
+                self.served_from_cache = True
+                return recent
+
+        # Read once, so recommendations computed below are stored under the
+        # version they were computed for
+        version = recommendation_cache_version(user.id)
+        if not force_refresh:
+            cached = self._get_cached_recommendations(
+                user, recommendation_type, limit, version
+            )
+            if cached is not None:
+                self.served_from_cache = True
+                self._remember_recommendations(memo_key, cached)
+                return cached
+
         try:
             if recommendation_type == "trending":
-                return self._get_trending_recommendations(limit)
+                recommendations = self._get_trending_recommendations(limit)
             elif recommendation_type == "content":
-                return self._get_content_recommendations(user, limit)
+                recommendations = self._get_content_recommendations(user, limit)
             else:  # hybrid or collaborative
-                return self._get_hybrid_recommendations(user, limit)
+                recommendations = self._get_hybrid_recommendations(user, limit)
         except Exception as e:
             logger.error(f"Error generating recommendations: {e}")
             return self._get_fallback_recommendations(limit)
 
+        self._cache_recommendations(user, recommendation_type, recommendations, version)
+        self._remember_recommendations(memo_key, recommendations)
+        return recommendations
+
+    @staticmethod
+    def _get_recent_recommendations(key):
+        """Get copies of recommendations served for key within the TTL"""
+        now = time.monotonic()
+        with _recent_recommendations_lock:
+            entry = _recent_recommendations.get(key)
+            if entry is None or now - entry[0] >= RECENT_RECOMMENDATIONS_TTL:
+                return None
+            _recent_recommendations.move_to_end(key)
+        return [dict(movie) for movie in entry[1]]
+
+    @staticmethod
+    def _remember_recommendations(key, recommendations):
+        """Keep copies of served recommendations in the in-process LRU"""
+        entry = (time.monotonic(), [dict(movie) for movie in recommendations])
+        with _recent_recommendations_lock:
+            _recent_recommendations[key] = entry
+            _recent_recommendations.move_to_end(key)
+            while len(_recent_recommendations) > RECENT_RECOMMENDATIONS_MAX_SIZE:
+                _recent_recommendations.popitem(last=False)
+
+    def _get_cached_recommendations(self, user, recommendation_type, limit, version):
+        """
+        Get unexpired recommendations from RecommendationCache.
+
+        The row is read from the shared cache when possible and only falls
+        back to the database on a cache miss. Returns None on a miss, when the cached list is shorter than ``limit``
+        or when any cached movie can no longer be loaded from TMDb. Entries
+        past their refresh time are still served while a background task
+        regenerates them. Only entries stored under the user's current
+        ``version`` are read.
+        """
+        try:
+            key = recommendation_cache_key(user.id, recommendation_type, version)
+            entry = cache.get(key)
+            if entry is None:
+                # Read the columns as a tuple; no model instance is needed
+                entry = (
+                    RecommendationCache.objects.filter(
+                        user=user,
+                        recommendation_type=recommendation_type,
+                        version=version,
+                        expires_at__gt=timezone.now(),
+                    )
+                    .values_list("movie_ids", "scores", "refresh_after", "expires_at")
+                    .first()
+                )
+                if entry is None:
+                    return None
+                self._set_cache_entry(key, entry)
+
+            if len(entry[0]) < limit:
+                return None
+
+            movie_ids, scores, refresh_after = entry[0][:limit], entry[1], entry[2]
+            movies = self._hydrate_movies(movie_ids)
+            if len(movies) < len(movie_ids):
+                return None
+
+            if refresh_after is not None and refresh_after <= timezone.now():
+                self._queue_refresh(user, recommendation_type, len(entry[0]))
+
+            recommendations = []
+            for movie_id, (score, reason) in zip(movie_ids, scores):
+                movie = movies[movie_id]
+                movie["recommendation_score"] = score
+                movie["recommendation_reason"] = reason
+                recommendations.append(movie)
+            return recommendations
+        except Exception as e:
+            logger.error(f"Error reading cached recommendations: {e}")
+            return None
+
+    def _queue_refresh(self, user, recommendation_type, limit):
+        """Queue regeneration of a stale RecommendationCache entry"""
+        from .tasks import refresh_recommendations
+
+        pending_key = f"recommendation_refresh_{user.id}_{recommendation_type}"
+        if not cache.add(pending_key, True, self.REFRESH_PENDING_TIMEOUT):
+            # Already queued by an earlier request
+            return
+
+        try:
+            refresh_recommendations.delay(user.id, recommendation_type, limit)
+        except Exception as e:
+            cache.delete(pending_key)
+            logger.warning(f"Could not queue recommendation refresh: {e}")
+
+    @staticmethod
+    def _set_cache_entry(key, entry):
+        """Mirror a RecommendationCache row in the shared cache until it expires"""
+        timeout = (entry[3] - timezone.now()).total_seconds()
+        if timeout > 0:
+            cache.set(key, entry, timeout=timeout)
+
+    def _cache_recommendations(
+        self, user, recommendation_type, recommendations, version
+    ):
+        """
+        Store recommendations in RecommendationCache for the user's TTL
+
+        Entries are refreshed in the background once the TTL passes and
+        expire ``STALE_TIMEOUT`` later. The row is mirrored in the shared
+        cache, which serves reads.
+        """
+        if not recommendations:
+            return
+        try:
+            cache_hours = self._get_user_settings(user).cache_duration_hours
+            refresh_after = timezone.now() + timedelta(hours=cache_hours)
+            expires_at = refresh_after + self.STALE_TIMEOUT
+            cache.set_many(
+                {
+                    self._movie_cache_key(movie["id"]): self._movie_summary(movie)
+                    for movie in recommendations
+                },
+                timeout=(expires_at - timezone.now()).total_seconds(),
+            )
+            entry = (
+                [movie["id"] for movie in recommendations],
+                [
+                    [
+                        movie.get("recommendation_score", 0),
+                        movie.get("recommendation_reason", ""),
+                    ]
+                    for movie in recommendations
+                ],
+                refresh_after,
+                expires_at,
+            )
+            # Upsert in a single INSERT ... ON CONFLICT statement
+            RecommendationCache.objects.bulk_create(
+                [
+                    RecommendationCache(
+                        user=user,
+                        recommendation_type=recommendation_type,
+                        movie_ids=entry[0],
+                        scores=entry[1],
+                        refresh_after=refresh_after,
+                        expires_at=expires_at,
+                        version=version,
+                    )
+                ],
+                update_conflicts=True,
+                unique_fields=["user", "recommendation_type"],
+                update_fields=[
+                    "movie_ids",
+                    "scores",
+                    "expires_at",
+                    "refresh_after",
+                    "version",
+                ],
+            )
+            self._set_cache_entry(
+                recommendation_cache_key(user.id, recommendation_type, version), entry
+            )
+        except Exception as e:
+            logger.error(f"Error caching recommendations: {e}")
+
+    def _get_user_settings(self, user):
+        """Get user recommendation settings"""
+        try:
+            return user.recommendation_settings
+        except RecommendationSettings.DoesNotExist:
+            settings, created = RecommendationSettings.objects.get_or_create(user=user)
+            return settings
+
+    def _hydrate_movies(self, movie_ids):
+        """
+        Load movie list fields for cached recommendation IDs.
+
+        Summaries stored alongside the RecommendationCache row are read in one
+        cache round trip; any that were evicted are rebuilt from TMDb details,
+        which the client fetches concurrently. Movies that fail to load are
+        omitted.
+        """
+        cache_keys = {
+            self._movie_cache_key(movie_id): movie_id for movie_id in movie_ids
+        }
+        movies = {
+            cache_keys[key]: movie for key, movie in cache.get_many(cache_keys).items()
+        }
+
+        missing = [movie_id for movie_id in movie_ids if movie_id not in movies]
+        if missing:
+            details = self.tmdb_client.get_movie_details_bulk(missing)
+            for movie_id, movie_details in details.items():
+                movies[movie_id] = self._movie_summary(movie_details)
+
+        return movies
+
+    @staticmethod
+    def _movie_cache_key(movie_id):
+        """Cache key for a recommended movie's list fields"""
+        return f"recommended_movie_{movie_id}"
+
+    @staticmethod
+    def _movie_summary(movie):
+        """Reduce a TMDb movie list result or details to the list fields"""
+        genre_ids = movie.get("genre_ids")
+        if genre_ids is None:
+            genre_ids = [genre["id"] for genre in movie.get("genres", [])]
+        return {
+            "id": movie["id"],
+            "title": movie.get("title", ""),
+            "overview": movie.get("overview", ""),
+            "poster_path": movie.get("poster_path"),
+            "backdrop_path": movie.get("backdrop_path"),
+            "release_date": movie.get("release_date"),
+            "vote_average": movie.get("vote_average", 0),
+            "vote_count": movie.get("vote_count", 0),
+            "popularity": movie.get("popularity", 0),
+            "genre_ids": genre_ids,
+        }
+
     def _get_trending_recommendations(self, limit=20):
         """Get trending movies"""
         try:
-            result = self.tmdb_client.get_trending_movies()
-            movies = result.get("results", [])[:limit]
+            movies = self._get_movie_list("trending")[:limit]
 
             for movie in movies:
                 movie["recommendation_score"] = movie.get("popularity", 0) / 1000
@@ -56,17 +353,15 @@ class BasicRecommendationEngine:
     def _get_content_recommendations(self, user, limit=20):
         """Get content-based recommendations"""
         try:
-            # Get user's favorite movie IDs
-            user_favorites = SimpleFavorite.objects.filter(user=user).values_list(
-                "movie_id", flat=True
-            )
-
-            if not user_favorites:
+            if not self._user_has_favorites(user):
                 return self._get_trending_recommendations(limit)
 
-            # Get popular movies as base recommendations
-            result = self.tmdb_client.get_popular_movies()
-            movies = result.get("results", [])[:limit]
+            # Get popular movies meeting the user's quality thresholds; TMDb
+            # applies the vote filters, so nothing is filtered here
+            settings = self._get_user_settings(user)
+            movies = self._get_movie_list(
+                "discover", **self._discover_params(settings)
+            )[:limit]
 
             for movie in movies:
                 movie["recommendation_score"] = movie.get("vote_average", 0) / 10
@@ -82,38 +377,51 @@ class BasicRecommendationEngine:
     def _get_hybrid_recommendations(self, user, limit=20):
         """Get hybrid recommendations"""
         try:
-            # Simple hybrid: 50% trending, 50% content-based
-            trending = self._get_trending_recommendations(limit // 2)
-            content = self._get_content_recommendations(user, limit // 2)
+            # Simple hybrid: 50% trending, 50% content-based. Each leg gets
+            # its full TMDb page once and is sliced here, so movies shared by
+            # both legs can be backfilled. Favorites and settings are read
+            # here, on the request thread, so the threads fetching the TMDb
+            # lists for both legs never touch the database.
+            movie_lists = [("trending", {})]
+            if self._user_has_favorites(user):
+                settings = self._get_user_settings(user)
+                movie_lists.append(("discover", self._discover_params(settings)))
+            self._prefetch_movie_lists(movie_lists)
+            trending = self._get_trending_recommendations(None)
+            content = self._get_content_recommendations(user, None)
 
-            # Combine and adjust scores
-            all_recommendations = []
+            # Combine and adjust scores, removing duplicates by movie ID as
+            # we go; the first occurrence (trending before content) is kept
+            unique_by_id = {}
+            backfill = []
+            for movies, reason, quota in (
+                (trending, "Hybrid: Trending", limit - limit // 2),
+                (content, "Hybrid: Content-based", limit // 2),
+            ):
+                taken = 0
+                for movie in movies:
+                    if movie["id"] in unique_by_id:
+                        continue
+                    movie["recommendation_score"] = (
+                        movie.get("recommendation_score", 0) * 0.5
+                    )
+                    movie["recommendation_reason"] = reason
+                    if taken < quota:
+                        unique_by_id[movie["id"]] = movie
+                        taken += 1
+                    else:
+                        backfill.append(movie)
 
-            for movie in trending:
-                movie["recommendation_score"] = (
-                    movie.get("recommendation_score", 0) * 0.5
-                )
-                movie["recommendation_reason"] = "Hybrid: Trending"
-                all_recommendations.append(movie)
+            # Top up from the rest of the pages when duplicates left a gap
+            for movie in backfill:
+                if len(unique_by_id) >= limit:
+                    break
+                unique_by_id.setdefault(movie["id"], movie)
+            unique_recommendations = list(unique_by_id.values())
 
-            for movie in content:
-                movie["recommendation_score"] = (
-                    movie.get("recommendation_score", 0) * 0.5
-                )
-                movie["recommendation_reason"] = "Hybrid: Content-based"
-                all_recommendations.append(movie)
-
-            # Remove duplicates by movie ID
-            seen_ids = set()
-            unique_recommendations = []
-            for movie in all_recommendations:
-                if movie["id"] not in seen_ids:
-                    seen_ids.add(movie["id"])
-                    unique_recommendations.append(movie)
-
-            # Sort by score
+            # Sort by score; every movie has recommendation_score set above
             unique_recommendations.sort(
-                key=lambda x: x.get("recommendation_score", 0), reverse=True
+                key=itemgetter("recommendation_score"), reverse=True
             )
 
             return unique_recommendations[:limit]
@@ -124,8 +432,7 @@ class BasicRecommendationEngine:
     def _get_fallback_recommendations(self, limit=20):
         """Fallback to popular movies"""
         try:
-            result = self.tmdb_client.get_popular_movies()
-            movies = result.get("results", [])[:limit]
+            movies = self._get_movie_list("popular")[:limit]
 
             for movie in movies:
                 movie["recommendation_score"] = 0.5
@@ -135,3 +442,58 @@ class BasicRecommendationEngine:
         except Exception as e:
             logger.error(f"Error getting fallback recommendations: {e}")
             return []
+
+    def _user_has_favorites(self, user):
+        """Check whether the user has favorites, querying at most once per engine"""
+        has_favorites = self._has_favorites.get(user.id)
+        if has_favorites is None:
+            has_favorites = SimpleFavorite.objects.filter(user=user).exists()
+            self._has_favorites[user.id] = has_favorites
+        return has_favorites
+
+    @staticmethod
+    def _discover_params(settings):
+        """TMDb discover filters for the user's quality thresholds"""
+        return {
+            "min_vote_average": settings.min_vote_average,
+            "min_vote_count": settings.min_vote_count,
+        }
+
+    def _prefetch_movie_lists(self, movie_lists):
+        """
+        Fetch several TMDb movie lists concurrently into the engine's lists.
+
+        The worker threads only make TMDb requests, never ORM queries. A list
+        that fails to load is left for _get_movie_list to fetch and report.
+        """
+        if len(movie_lists) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=len(movie_lists)) as executor:
+            futures = [
+                executor.submit(self._get_movie_list, list_name, **params)
+                for list_name, params in movie_lists
+            ]
+        for future in futures:
+            if future.exception() is not None:
+                logger.debug(f"Could not prefetch movie list: {future.exception()}")
+
+    def _get_movie_list(self, list_name, **params):
+        """
+        Get the trending, popular or discover TMDb movie list.
+
+        The TMDb client caches these lists in Redis; the result is also kept on
+        the engine so one request reads each list at most once. Movies are
+        returned as copies because callers write scores onto them.
+        """
+        key = (list_name, *sorted(params.items()))
+        if key not in self._movie_lists:
+            if list_name == "trending":
+                result = self.tmdb_client.get_trending_movies()
+            elif list_name == "discover":
+                result = self.tmdb_client.discover_movies(
+                    sort_by="popularity.desc", **params
+                )
+            else:
+                result = self.tmdb_client.get_popular_movies()
+            self._movie_lists[key] = result.get("results", [])
+        return [dict(movie) for movie in self._movie_lists[key]]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0002_simpleviewinghistory_simplefavorite"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="simpleviewinghistory",
+            index=models.Index(
+                fields=["user", "-created_at"], name="recommendat_user_id_dff482_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0003_simpleviewinghistory_recommendat_user_id_dff482_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="recommendationcache",
+            name="recommendat_user_id_c71f10_idx",
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "recommendations",
+            "0004_remove_recommendationcache_recommendat_user_id_c71f10_idx",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="simpleviewinghistory",
+            index=models.Index(
+                fields=["user", "movie_id"], name="recommendat_user_id_140d64_idx"
+            ),
+        ),
+    ]
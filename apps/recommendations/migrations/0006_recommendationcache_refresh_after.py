@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0005_simpleviewinghistory_recommendat_user_id_140d64_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recommendationcache",
+            name="refresh_after",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When this cache entry is regenerated in the background",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0006_recommendationcache_refresh_after"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TMDbMovieCache",
+            fields=[
+                (
+                    "movie_id",
+                    models.PositiveIntegerField(
+                        help_text="TMDb movie ID", primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(help_text="Movie details as returned by TMDb"),
+                ),
+                ("fetched_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-16 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recommendations", "0007_tmdbmoviecache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recommendationcache",
+            name="version",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="Recommendation cache version of the user this entry was stored for",
+            ),
+        ),
+    ]
@@ -42,6 +42,9 @@ class SimpleViewingHistory(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["user", "watched_at"]),
+            models.Index(fields=["user", "-created_at"]),
+            # Lets (user, movie) interaction scans be answered from the index
+            models.Index(fields=["user", "movie_id"]),
             models.Index(fields=["movie_id"]),
         ]
 
@@ -70,11 +73,21 @@ class RecommendationCache(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(help_text="When this cache entry expires")
+    refresh_after = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When this cache entry is regenerated in the background",
+    )
+    version = models.BigIntegerField(
+        default=0,
+        help_text="Recommendation cache version of the user this entry was stored for",
+    )
 
     class Meta:
+        # The unique (user, recommendation_type) index also serves cache
+        # lookups; expires_at is only checked on the single matching row
         unique_together = ["user", "recommendation_type"]
         indexes = [
-            models.Index(fields=["user", "recommendation_type"]),
             models.Index(fields=["expires_at"]),
         ]
 
@@ -82,6 +95,17 @@ class RecommendationCache(models.Model):
         return f"{self.user.email} - {self.get_recommendation_type_display()}"
 
 
+class TMDbMovieCache(models.Model):
+    """Raw TMDb movie details kept locally so recommendations avoid the API"""
+
+    movie_id = models.PositiveIntegerField(primary_key=True, help_text="TMDb movie ID")
+    payload = models.JSONField(help_text="Movie details as returned by TMDb")
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"TMDb movie {self.movie_id}"
+
+
 class UserSimilarity(models.Model):
     """Store user similarity scores for collaborative filtering"""
 
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.preferences.serializers import EagerLoadingMixin
 from .models import (
     RecommendationCache,
     UserSimilarity,
@@ -10,6 +11,43 @@ from .models import (
 
 User = get_user_model()
 
+# TMDb image URL prefixes for recommendation posters and backdrops
+POSTER_URL_PREFIX = "https://image.tmdb.org/t/p/w500"
+BACKDROP_URL_PREFIX = "https://image.tmdb.org/t/p/w1280"
+
+# Recommendation types RecommendationListView accepts, per algorithm
+BASIC_RECOMMENDATION_TYPES = (
+    "content",
+    "collaborative",
+    "hybrid",
+    "trending",
+    "similar",
+)
+ADVANCED_RECOMMENDATION_TYPES = (
+    "matrix_factorization",
+    "neural_cf",
+    "content_based_advanced",
+    "collaborative_knn",
+    "sequential",
+    "ensemble",
+    "hybrid",
+    "trending",
+    "content",  # Also support basic types
+)
+
+# algorithm -> (accepted types, error message), built once at import
+_VALID_TYPES = {
+    algorithm: (
+        frozenset(types),
+        f"Invalid recommendation type for {algorithm} algorithm. "
+        f"Must be one of: {', '.join(types)}",
+    )
+    for algorithm, types in (
+        ("basic", BASIC_RECOMMENDATION_TYPES),
+        ("advanced", ADVANCED_RECOMMENDATION_TYPES),
+    )
+}
+
 
 class RecommendationSettingsSerializer(serializers.ModelSerializer):
     """Serializer for user recommendation settings"""
@@ -63,6 +101,44 @@ class RecommendationFeedbackSerializer(serializers.ModelSerializer):
         return value
 
 
+def _optional(convert, value):
+    """Apply convert to value unless it is None"""
+    return None if value is None else convert(value)
+
+
+def movie_recommendation_representation(movie):
+    """
+    Build the API representation of a TMDb movie recommendation dict.
+
+    Produces the same output as running MovieRecommendationSerializer's fields,
+    without DRF's per-field dispatch; recommendation lists are rendered on
+    every request, so this is done by hand.
+    """
+    poster_path = movie.get("poster_path")
+    backdrop_path = movie.get("backdrop_path")
+    score = movie["recommendation_score"]
+    return {
+        "id": _optional(int, movie["id"]),
+        "title": _optional(str, movie["title"]),
+        "overview": _optional(str, movie["overview"]),
+        "poster_path": _optional(str, poster_path),
+        "backdrop_path": _optional(str, backdrop_path),
+        "release_date": _optional(str, movie.get("release_date")),
+        "vote_average": _optional(float, movie["vote_average"]),
+        "vote_count": _optional(int, movie["vote_count"]),
+        "popularity": _optional(float, movie["popularity"]),
+        "genre_ids": _optional(
+            lambda genre_ids: [int(genre_id) for genre_id in genre_ids],
+            movie["genre_ids"],
+        ),
+        # Round the recommendation score for readability
+        "recommendation_score": _optional(lambda s: round(float(s), 3), score),
+        "recommendation_reason": _optional(str, movie["recommendation_reason"]),
+        "poster_url": POSTER_URL_PREFIX + poster_path if poster_path else None,
+        "backdrop_url": BACKDROP_URL_PREFIX + backdrop_path if backdrop_path else None,
+    }
+
+
 class MovieRecommendationSerializer(serializers.Serializer):
     """Serializer for individual movie recommendations"""
 
@@ -81,26 +157,7 @@ class MovieRecommendationSerializer(serializers.Serializer):
 
     def to_representation(self, instance):
         """Format the recommendation for API response"""
-        data = super().to_representation(instance)
-
-        # Format poster and backdrop URLs
-        if data.get("poster_path"):
-            data["poster_url"] = f"https://image.tmdb.org/t/p/w500{data['poster_path']}"
-        else:
-            data["poster_url"] = None
-
-        if data.get("backdrop_path"):
-            data["backdrop_url"] = (
-                f"https://image.tmdb.org/t/p/w1280{data['backdrop_path']}"
-            )
-        else:
-            data["backdrop_url"] = None
-
-        # Round the recommendation score for readability
-        if data.get("recommendation_score"):
-            data["recommendation_score"] = round(data["recommendation_score"], 3)
-
-        return data
+        return movie_recommendation_representation(instance)
 
 
 class RecommendationListSerializer(serializers.Serializer):
@@ -114,14 +171,31 @@ class RecommendationListSerializer(serializers.Serializer):
 
     def to_representation(self, instance):
         """Format the recommendation list for API response"""
-        data = super().to_representation(instance)
+        # Built by hand so the movie list is rendered in a single pass
+        recommendation_type = str(instance["recommendation_type"])
+        total_count = int(instance["total_count"])
+        cached = bool(instance.get("cached", False))
+        generated_at = self.fields["generated_at"].to_representation(
+            instance["generated_at"]
+        )
+        data = {
+            "recommendation_type": recommendation_type,
+            "total_count": total_count,
+            "cached": cached,
+            "generated_at": generated_at,
+            "recommendations": [
+                movie_recommendation_representation(movie)
+                for movie in instance["recommendations"]
+            ],
+        }
 
-        # Add metadata
+        # Add metadata, including any the view supplied (plain values only)
         data["metadata"] = {
-            "algorithm_used": data["recommendation_type"],
-            "total_recommendations": data["total_count"],
-            "from_cache": data["cached"],
-            "generated_at": data["generated_at"],
+            "algorithm_used": recommendation_type,
+            "total_recommendations": total_count,
+            "from_cache": cached,
+            "generated_at": generated_at,
+            **instance.get("metadata", {}),
         }
 
         return data
@@ -158,7 +232,7 @@ class RecommendationAnalyticsSerializer(serializers.Serializer):
         return data
 
 
-class UserSimilaritySerializer(serializers.ModelSerializer):
+class UserSimilaritySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for user similarity data"""
 
     user1_email = serializers.EmailField(source="user1.email", read_only=True)
@@ -168,6 +242,7 @@ class UserSimilaritySerializer(serializers.ModelSerializer):
         model = UserSimilarity
         fields = ["user1_email", "user2_email", "similarity_score", "last_updated"]
         read_only_fields = ["last_updated"]
+        select_related = ("user1", "user2")
 
 
 class MovieSimilaritySerializer(serializers.ModelSerializer):
@@ -185,6 +260,32 @@ class MovieSimilaritySerializer(serializers.ModelSerializer):
         read_only_fields = ["last_updated"]
 
 
+class RecommendationQuerySerializer(serializers.Serializer):
+    """Serializer for recommendation list query parameters"""
+
+    LIMIT_ERROR = "Limit must be between 1 and 100"
+
+    type = serializers.CharField(default="hybrid", allow_blank=True)
+    limit = serializers.IntegerField(
+        default=20,
+        min_value=1,
+        max_value=100,
+        error_messages={"min_value": LIMIT_ERROR, "max_value": LIMIT_ERROR},
+    )
+    force_refresh = serializers.BooleanField(default=False)
+    # Anything other than 'advanced' selects the basic algorithm
+    algorithm = serializers.CharField(default="basic", allow_blank=True)
+
+    def validate(self, attrs):
+        """Validate the recommendation type against the chosen algorithm"""
+        valid_types, message = _VALID_TYPES.get(
+            attrs["algorithm"], _VALID_TYPES["basic"]
+        )
+        if attrs["type"] not in valid_types:
+            raise serializers.ValidationError({"type": message})
+        return attrs
+
+
 class RecommendationRequestSerializer(serializers.Serializer):
     """Serializer for recommendation request parameters"""
 
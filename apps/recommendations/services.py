@@ -5,39 +5,28 @@ This module implements various recommendation strategies:
 - Content-based filtering (genre, cast, director similarity)
 - Collaborative filtering (user-based)
 - Hybrid approach combining multiple strategies
-- Trending and popular r        # From favorites
-        favorites = SimpleFavorite.objects.filter(user=user)
-        for favorite in favorites:
-            try:
-                movie_data = self.tmdb_client.get_movie_details(favorite.movie_id)
-                for genre in movie_data.get('genres', []):
-                    genre_scores[genre['id']] += 1.0
-            except Exception:
-                continue
-        
-        # From viewing history with rating weights
-        viewing_history = SimpleViewingHistory.objects.filter(user=user)
-        for history in viewing_history:
-            try:
-                movie_data = self.tmdb_client.get_movie_details(history.movie_id)
-                weight = (history.rating or 5) / 10.0  # Normalize rating to 0-1
-                for genre in movie_data.get('genres', []):
-                    genre_scores[genre['id']] += weight
-            except Exception:
-                continueimport math
+- Trending and popular recommendations
+"""
+
+import heapq
+import math
 import logging
+import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Iterator, Tuple, Optional
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q
+from django.db.models import Avg, Count, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.cache import cache
 
 from apps.movies.services import MovieService
-from apps.favorites.models import UserFavorite
 from apps.preferences.models import UserPreference, ViewingHistory
+from .basic_engine import recommendation_cache_version
 # Use simple models for TMDb ID compatibility
 from .models import SimpleFavorite, SimpleViewingHistory
 from .models import (
@@ -45,12 +34,35 @@ from .models import (
     UserSimilarity, 
     MovieSimilarity, 
     RecommendationSettings,
-    RecommendationFeedback
+    RecommendationFeedback,
+    TMDbMovieCache,
 )
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Genre preference vectors are rebuilt when favorites or history change
+USER_GENRE_PREFERENCES_CACHE_KEY = 'user_genre_prefs_{}'
+USER_GENRE_PREFERENCES_TTL = 3600  # seconds
+
+# Nearest neighbours kept per user in UserSimilarity, written in batches
+SIMILAR_USERS_STORED = 50
+SIMILARITY_BATCH_SIZE = 5000
+# Users scored per matrix product when refreshing every user's neighbours
+SIMILARITY_BLOCK_SIZE = 1024
+# Marks users found to have no neighbours, so the ratings are not reloaded
+# for them on every request
+NO_SIMILAR_USERS_CACHE_KEY = 'no_similar_users_{}'
+NO_SIMILAR_USERS_TTL = 3600  # seconds
+
+# Movie details stored in TMDbMovieCache are refetched once older than this
+MOVIE_DETAILS_MAX_AGE = timedelta(hours=24)
+
+
+def forget_user_genre_preferences(user_id):
+    """Drop a user's cached genre preference vector"""
+    cache.delete(USER_GENRE_PREFERENCES_CACHE_KEY.format(user_id))
+
 
 class RecommendationEngine:
     """Main recommendation engine combining multiple strategies"""
@@ -59,6 +71,9 @@ class RecommendationEngine:
         self.movie_service = MovieService()
         # Access the TMDb client directly for some operations
         self.tmdb_client = self.movie_service.tmdb_client
+        self._genre_map = None
+        # Movie details fetched during the current get_recommendations call
+        self._details_cache: Dict[int, Dict] = {}
     
     def get_recommendations(
         self, 
@@ -79,6 +94,8 @@ class RecommendationEngine:
         Returns:
             List of movie dictionaries with recommendation scores
         """
+        self._details_cache = {}
+        
         # Get user's recommendation settings
         settings = self._get_user_settings(user)
         
@@ -100,14 +117,44 @@ class RecommendationEngine:
         else:  # hybrid
             recommendations = self._hybrid_recommendations(user, limit)
         
-        # Apply user filters and preferences
-        recommendations = self._apply_user_filters(recommendations, settings)
+        # Apply user filters and preferences, stopping once enough movies pass
+        recommendations = list(islice(self._apply_user_filters(recommendations, settings), limit * 2))
         
         # Cache the results
         self._cache_recommendations(user, recommendation_type, recommendations, settings)
         
         return recommendations[:limit]
     
+    def refresh_user_similarities(self) -> int:
+        """
+        Recompute the stored nearest neighbours of every user with ratings.
+        
+        Neighbours that no longer qualify are removed. Returns the number of
+        UserSimilarity rows written.
+        """
+        started_at = timezone.now()
+        pairs, ratings = self._load_centered_ratings()
+        
+        stored = 0
+        batch = []
+        for user_id, similar_users in self._rank_all_similar_users(pairs, ratings, SIMILAR_USERS_STORED):
+            batch.extend(
+                UserSimilarity(user1_id=user_id, user2_id=other_id, similarity_score=score)
+                for other_id, score in similar_users
+            )
+            if len(batch) >= SIMILARITY_BATCH_SIZE:
+                self._store_similar_users(batch)
+                stored += len(batch)
+                batch = []
+        if batch:
+            self._store_similar_users(batch)
+            stored += len(batch)
+        
+        # Rows not rewritten above belong to pairs that are no longer neighbours
+        UserSimilarity.objects.filter(last_updated__lt=started_at).delete()
+        
+        return stored
+    
     def _content_based_recommendations(self, user: User, limit: int = 20) -> List[Dict]:
         """Generate content-based recommendations based on user's favorites and viewing history"""
         
@@ -118,138 +165,221 @@ class RecommendationEngine:
             # Fallback to popular movies if no user data
             return self._get_popular_movies(limit)
         
-        # Get movies similar to user's preferences
-        recommendations = []
-        
-        # Use TMDb discover API with user's preferred genres
-        preferred_genres = list(user_genre_preferences.keys())
-        
+        queries = self._content_discover_queries(user, user_genre_preferences)
         try:
-            # Get movies from multiple genre combinations
-            for genre_id in preferred_genres[:3]:  # Top 3 preferred genres
-                movies = self.movie_service.discover_movies(
-                    genre_ids=[genre_id],
-                    sort_by='vote_average.desc',
-                    page=1
-                )
-                
-                for movie in movies.get('results', []):
-                    # Calculate content-based score
-                    score = self._calculate_content_score(movie, user_genre_preferences)
-                    movie['recommendation_score'] = score
-                    movie['recommendation_reason'] = f"Based on your interest in {self._get_genre_name(genre_id)}"
-                    recommendations.append(movie)
-        
+            genre_results = [
+                (genre_id, self.movie_service.discover_movies(**params))
+                for genre_id, params in queries
+            ]
+            return self._rank_content_recommendations(
+                genre_results, user_genre_preferences, limit
+            )
         except Exception as e:
             logger.error(f"Error in content-based recommendations: {e}")
             return self._get_popular_movies(limit)
+    
+    def _content_discover_queries(
+        self, user: User, user_genre_preferences: Dict[int, float]
+    ) -> List[Tuple[int, Dict]]:
+        """
+        Build the TMDb discover parameters for the user's top 3 genres.
         
-        # Remove duplicates and sort by score
-        seen_ids = set()
-        unique_recommendations = []
-        for movie in recommendations:
-            if movie['id'] not in seen_ids:
-                seen_ids.add(movie['id'])
-                unique_recommendations.append(movie)
-        
-        # Sort by recommendation score
-        unique_recommendations.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return unique_recommendations[:limit]
+        TMDb applies the user's rating and release year filters, so fewer
+        movies are returned only to be dropped by _apply_user_filters.
+        """
+        settings = self._get_user_settings(user)
+        min_year = datetime.now().year - settings.release_year_range
+        
+        return [
+            (
+                genre_id,
+                {
+                    'genre_ids': [genre_id],
+                    'sort_by': 'vote_average.desc',
+                    'page': 1,
+                    'min_vote_average': settings.min_vote_average,
+                    'min_vote_count': settings.min_vote_count,
+                    'primary_release_date.gte': f'{min_year}-01-01',
+                },
+            )
+            for genre_id in list(user_genre_preferences)[:3]
+        ]
+    
+    def _rank_content_recommendations(
+        self,
+        genre_results: List[Tuple[int, Dict]],
+        user_genre_preferences: Dict[int, float],
+        limit: int = 20,
+    ) -> List[Dict]:
+        """Score the movies discovered for each genre and keep the best"""
+        
+        # Movies similar to user's preferences by ID, keeping the reason of the
+        # first genre that found them
+        recommendations = {}
+        for genre_id, movies in genre_results:
+            reason = f"Based on your interest in {self._get_genre_name(genre_id)}"
+            for movie in movies.get('results', []):
+                if movie['id'] not in recommendations:
+                    movie['recommendation_reason'] = reason
+                    recommendations[movie['id']] = movie
+        
+        # Calculate content-based scores for all movies at once
+        unique_recommendations = list(recommendations.values())
+        scores = self._calculate_content_scores(unique_recommendations, user_genre_preferences)
+        for movie, score in zip(unique_recommendations, scores.tolist()):
+            movie['recommendation_score'] = score
+        
+        # Keep the highest scoring recommendations
+        return heapq.nlargest(
+            limit, unique_recommendations, key=lambda x: x.get('recommendation_score', 0)
+        )
     
     def _collaborative_filtering(self, user: User, limit: int = 20) -> List[Dict]:
         """Generate recommendations based on similar users' preferences"""
         
+        candidates = self._collaborative_candidates(user, limit)
+        
+        if candidates is None:
+            # Fallback to content-based if no similar users
+            return self._content_based_recommendations(user, limit)
+        
+        return self._build_collaborative_recommendations(candidates, limit)
+    
+    def _collaborative_candidates(self, user: User, limit: int = 20) -> Optional[List[Tuple[int, float]]]:
+        """
+        Score movies favorited by similar users without fetching their details.
+        
+        Returns (movie_id, score) pairs, best first, or None if the user has
+        no similar users.
+        """
+        
         # Find similar users based on favorites and viewing history
         similar_users = self._find_similar_users(user)
         
         if not similar_users:
-            # Fallback to content-based if no similar users
-            return self._content_based_recommendations(user, limit)
+            return None
         
         # Get movie recommendations from similar users
         recommended_movie_ids = defaultdict(float)
-        user_favorites = set(
-            SimpleFavorite.objects.filter(user=user).values_list('movie_id', flat=True)
-        )
+        # Excluded with a subquery, so the user's favorites never leave the database
+        user_favorites = SimpleFavorite.objects.filter(user=user).values('movie_id')
         
-        for similar_user_id, similarity_score in similar_users[:10]:  # Top 10 similar users
-            similar_user = User.objects.get(id=similar_user_id)
-            
-            # Get their favorites
-            similar_user_favorites = SimpleFavorite.objects.filter(
-                user=similar_user
-            ).exclude(movie_id__in=user_favorites)
-            
-            for favorite in similar_user_favorites:
-                recommended_movie_ids[favorite.movie_id] += similarity_score
+        # Get the favorites of the top 10 similar users in one query
+        similarity_by_user = dict(similar_users[:10])
+        similar_user_favorites = SimpleFavorite.objects.filter(
+            user_id__in=similarity_by_user
+        ).exclude(movie_id__in=user_favorites).values_list('user_id', 'movie_id')
         
-        # Get movie details and create recommendations
-        recommendations = []
+        for similar_user_id, movie_id in similar_user_favorites:
+            recommended_movie_ids[movie_id] += similarity_by_user[similar_user_id]
         
-        for movie_id, score in sorted(recommended_movie_ids.items(), key=lambda x: x[1], reverse=True)[:limit * 2]:
-            try:
-                movie_data = self.tmdb_client.get_movie_details(movie_id)
-                movie_data['recommendation_score'] = score
-                movie_data['recommendation_reason'] = "Based on users with similar taste"
-                recommendations.append(movie_data)
-            except Exception as e:
-                logger.warning(f"Could not get details for movie {movie_id}: {e}")
-                continue
+        return heapq.nlargest(limit * 2, recommended_movie_ids.items(), key=lambda x: x[1])
+    
+    def _build_collaborative_recommendations(
+        self,
+        candidates: List[Tuple[int, float]],
+        limit: int = 20,
+        known_movies: Optional[Dict[int, Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Turn collaborative candidates into recommendations.
+        
+        Movies already present in known_movies are copied from there; details
+        for the rest are fetched in one batch.
+        """
+        
+        known_movies = known_movies or {}
+        details = self._get_movie_details_bulk(
+            [movie_id for movie_id, _ in candidates if movie_id not in known_movies]
+        )
+        
+        recommendations = []
+        for movie_id, score in candidates:
+            if movie_id in known_movies:
+                movie_data = dict(known_movies[movie_id])
+            else:
+                movie_data = details.get(movie_id)
+                if movie_data is None:
+                    continue
+            movie_data['recommendation_score'] = score
+            movie_data['recommendation_reason'] = "Based on users with similar taste"
+            recommendations.append(movie_data)
         
         return recommendations[:limit]
     
     def _hybrid_recommendations(self, user: User, limit: int = 20) -> List[Dict]:
         """Combine multiple recommendation strategies for better results"""
         
-        # Get recommendations from different strategies
-        content_recs = self._content_based_recommendations(user, limit // 2)
-        collaborative_recs = self._collaborative_filtering(user, limit // 2)
-        trending_recs = self._trending_recommendations(user, limit // 4)
-        
-        # Combine and weight the recommendations
-        all_recommendations = []
-        
-        # Content-based (weight: 0.4)
-        for movie in content_recs:
-            movie['recommendation_score'] = movie.get('recommendation_score', 0) * 0.4
-            movie['recommendation_reason'] = "Content-based: " + movie.get('recommendation_reason', '')
-            all_recommendations.append(movie)
-        
-        # Collaborative filtering (weight: 0.4)
-        for movie in collaborative_recs:
-            movie['recommendation_score'] = movie.get('recommendation_score', 0) * 0.4
-            movie['recommendation_reason'] = "Collaborative: " + movie.get('recommendation_reason', '')
-            all_recommendations.append(movie)
-        
-        # Trending boost (weight: 0.2)
-        for movie in trending_recs:
-            movie['recommendation_score'] = movie.get('recommendation_score', 0) * 0.2
-            movie['recommendation_reason'] = "Trending: " + movie.get('recommendation_reason', '')
-            all_recommendations.append(movie)
-        
-        # Merge duplicates by summing scores
-        movie_scores = defaultdict(lambda: {'movie': None, 'total_score': 0, 'reasons': []})
-        
-        for movie in all_recommendations:
-            movie_id = movie['id']
-            if movie_scores[movie_id]['movie'] is None:
-                movie_scores[movie_id]['movie'] = movie
-            movie_scores[movie_id]['total_score'] += movie.get('recommendation_score', 0)
-            movie_scores[movie_id]['reasons'].append(movie.get('recommendation_reason', ''))
-        
-        # Create final recommendations
-        final_recommendations = []
-        for movie_id, data in movie_scores.items():
-            movie = data['movie']
-            movie['recommendation_score'] = data['total_score']
-            movie['recommendation_reason'] = ' | '.join(set(data['reasons']))
-            final_recommendations.append(movie)
-        
-        # Sort by total score
-        final_recommendations.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
-        
-        return final_recommendations[:limit]
+        # Database reads happen here, on the request thread; only the TMDb
+        # requests of the content-based and trending strategies run
+        # concurrently, so the worker threads never touch the ORM
+        user_genre_preferences = self._get_user_genre_preferences(user)
+        content_queries = (
+            self._content_discover_queries(user, user_genre_preferences)
+            if user_genre_preferences else []
+        )
+        collaborative_candidates = self._collaborative_candidates(user, limit // 2)
+        
+        with ThreadPoolExecutor(max_workers=len(content_queries) + 1) as executor:
+            trending_future = executor.submit(self._trending_recommendations, user, limit // 4)
+            discover_futures = [
+                (genre_id, executor.submit(self.movie_service.discover_movies, **params))
+                for genre_id, params in content_queries
+            ]
+        trending_recs = trending_future.result()
+        
+        content_recs = None
+        if content_queries:
+            try:
+                content_recs = self._rank_content_recommendations(
+                    [(genre_id, future.result()) for genre_id, future in discover_futures],
+                    user_genre_preferences,
+                    limit // 2,
+                )
+            except Exception as e:
+                logger.error(f"Error in content-based recommendations: {e}")
+        if content_recs is None:
+            content_recs = self._get_popular_movies(limit // 2)
+        
+        if collaborative_candidates is None:
+            # No similar users: collaborative filtering falls back to the
+            # content-based results already computed above
+            collaborative_recs = [dict(movie) for movie in content_recs]
+        else:
+            # Only fetch details for movies the other strategies did not return
+            known_movies = {movie['id']: movie for movie in chain(content_recs, trending_recs)}
+            collaborative_recs = self._build_collaborative_recommendations(
+                collaborative_candidates, limit // 2, known_movies
+            )
+        
+        # Weight each strategy's recommendations and merge duplicates in a
+        # single pass, summing scores on the first copy of each movie
+        merged = {}
+        for recs, weight, prefix in (
+            (content_recs, 0.4, "Content-based: "),
+            (collaborative_recs, 0.4, "Collaborative: "),
+            (trending_recs, 0.2, "Trending: "),
+        ):
+            for movie in recs:
+                score = movie.get('recommendation_score', 0) * weight
+                reason = prefix + movie.get('recommendation_reason', '')
+                current = merged.get(movie['id'])
+                if current is None:
+                    movie['recommendation_score'] = score
+                    movie['_reasons'] = [reason]
+                    merged[movie['id']] = movie
+                else:
+                    current['recommendation_score'] += score
+                    current['_reasons'].append(reason)
+        
+        # Keep the highest total scores, joining reasons only for those
+        final_recommendations = heapq.nlargest(
+            limit, merged.values(), key=lambda x: x.get('recommendation_score', 0)
+        )
+        for movie in final_recommendations:
+            movie['recommendation_reason'] = ' | '.join(dict.fromkeys(movie.pop('_reasons')))
+        
+        return final_recommendations
     
     def _trending_recommendations(self, user: User, limit: int = 20) -> List[Dict]:
         """Get trending movies with user preference filtering"""
@@ -272,140 +402,371 @@ class RecommendationEngine:
     def _similar_movie_recommendations(self, user: User, limit: int = 20) -> List[Dict]:
         """Get recommendations based on movies similar to user's favorites"""
         
-        user_favorites = SimpleFavorite.objects.filter(user=user).values_list('movie_id', flat=True)
+        # Every favorite is needed to filter the results, so they are read in
+        # one query, most recent first, rather than with a separate LIMIT query
+        user_favorites = list(
+            SimpleFavorite.objects.filter(user=user)
+            .order_by('-created_at')
+            .values_list('movie_id', flat=True)
+        )
         
         if not user_favorites:
             return self._content_based_recommendations(user, limit)
         
-        recommendations = []
+        favorite_ids = set(user_favorites)
+        source_movie_ids = user_favorites[:5]  # Use the 5 most recent favorites
         
-        for favorite_movie_id in user_favorites[:5]:  # Use top 5 favorites
+        # Fetch recommendations for each favorite concurrently
+        with ThreadPoolExecutor(max_workers=len(source_movie_ids)) as executor:
+            futures = {
+                movie_id: executor.submit(self.tmdb_client.get_movie_recommendations, movie_id)
+                for movie_id in source_movie_ids
+            }
+        
+        # Collect movies, skipping duplicates and already favorited movies
+        recommendations = {}
+        for favorite_movie_id, future in futures.items():
             try:
-                similar_movies = self.tmdb_client.get_movie_recommendations(favorite_movie_id)
-                
-                for movie in similar_movies.get('results', []):
-                    if movie['id'] not in user_favorites:  # Don't recommend already favorited movies
-                        movie['recommendation_score'] = movie.get('vote_average', 0) / 10
-                        movie['recommendation_reason'] = f"Similar to movies you liked"
-                        recommendations.append(movie)
-            
+                similar_movies = future.result()
             except Exception as e:
                 logger.warning(f"Could not get similar movies for {favorite_movie_id}: {e}")
                 continue
+            
+            for movie in similar_movies.get('results', []):
+                if movie['id'] not in favorite_ids and movie['id'] not in recommendations:
+                    movie['recommendation_score'] = movie.get('vote_average', 0) / 10
+                    movie['recommendation_reason'] = f"Similar to movies you liked"
+                    recommendations[movie['id']] = movie
         
-        # Remove duplicates and sort
-        seen_ids = set()
-        unique_recommendations = []
-        for movie in recommendations:
-            if movie['id'] not in seen_ids:
-                seen_ids.add(movie['id'])
-                unique_recommendations.append(movie)
-        
-        unique_recommendations.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
+        unique_recommendations = list(recommendations.values())
         
-        return unique_recommendations[:limit]
+        return heapq.nlargest(
+            limit, unique_recommendations, key=lambda x: x.get('recommendation_score', 0)
+        )
     
     # Helper methods
     
+    def _get_movie_details_bulk(self, movie_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Get details for several movies, reusing those already fetched during
+        this request. Returns copies, so callers may annotate them freely.
+        """
+        missing = [movie_id for movie_id in movie_ids if movie_id not in self._details_cache]
+        if missing:
+            self._details_cache.update(self._load_movie_details(missing))
+        
+        return {
+            movie_id: dict(self._details_cache[movie_id])
+            for movie_id in movie_ids
+            if movie_id in self._details_cache
+        }
+    
+    def _load_movie_details(self, movie_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Load movie details from TMDbMovieCache, fetching those missing or
+        older than MOVIE_DETAILS_MAX_AGE from TMDb and storing them
+        """
+        details = dict(
+            TMDbMovieCache.objects.filter(
+                movie_id__in=movie_ids,
+                fetched_at__gt=timezone.now() - MOVIE_DETAILS_MAX_AGE,
+            ).values_list('movie_id', 'payload')
+        )
+        
+        missing = [movie_id for movie_id in movie_ids if movie_id not in details]
+        if missing:
+            fetched = self.tmdb_client.get_movie_details_bulk(missing)
+            if fetched:
+                TMDbMovieCache.objects.bulk_create(
+                    [
+                        TMDbMovieCache(movie_id=movie_id, payload=payload)
+                        for movie_id, payload in fetched.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=['movie_id'],
+                    update_fields=['payload', 'fetched_at'],
+                )
+            details.update(fetched)
+        
+        return details
+    
     def _get_user_genre_preferences(self, user: User) -> Dict[int, float]:
         """Get user's genre preferences based on favorites and viewing history"""
         
-        genre_scores = defaultdict(float)
+        cache_key = USER_GENRE_PREFERENCES_CACHE_KEY.format(user.pk)
+        cached_preferences = cache.get(cache_key)
+        if cached_preferences is not None:
+            return cached_preferences
+        
+        favorite_ids = list(
+            SimpleFavorite.objects.filter(user=user).values_list('movie_id', flat=True)
+        )
+        history = list(
+            SimpleViewingHistory.objects.filter(user=user).values_list('movie_id', 'rating')
+        )
+        
+        # Fetch details for every movie in one batch: cached details come from
+        # a single cache round trip and the rest are requested concurrently
+        movie_ids = set(favorite_ids).union(movie_id for movie_id, _ in history)
+        details = self._get_movie_details_bulk(list(movie_ids))
+        
+        # Collect (genre, weight) entries, then sum them per genre with bincount
+        genre_ids = []
+        weights = []
         
         # From favorites
-        favorites = UserFavorite.objects.filter(user=user).select_related()
-        for favorite in favorites:
-            try:
-                movie_data = self.tmdb_client.get_movie_details(favorite.movie_id)
-                for genre in movie_data.get('genres', []):
-                    genre_scores[genre['id']] += 1.0
-            except Exception:
-                continue
+        for movie_id in favorite_ids:
+            for genre in details.get(movie_id, {}).get('genres', []):
+                genre_ids.append(genre['id'])
+                weights.append(1.0)
         
         # From viewing history with rating weights
-        viewing_history = ViewingHistory.objects.filter(user=user)
-        for history in viewing_history:
-            try:
-                movie_data = self.movie_service.get_movie_details(history.movie_id)
-                weight = (history.rating or 5) / 10.0  # Normalize rating to 0-1
-                for genre in movie_data.get('genres', []):
-                    genre_scores[genre['id']] += weight
-            except Exception:
-                continue
-        
-        return dict(genre_scores)
+        for movie_id, rating in history:
+            weight = (rating or 5) / 10.0  # Normalize rating to 0-1
+            for genre in details.get(movie_id, {}).get('genres', []):
+                genre_ids.append(genre['id'])
+                weights.append(weight)
+        
+        # Preferences are ordered strongest first, so callers can take the
+        # top genres from the front
+        genre_scores = np.bincount(genre_ids, weights=weights) if genre_ids else np.zeros(0)
+        preferred = np.flatnonzero(genre_scores)
+        preferred = preferred[np.argsort(-genre_scores[preferred], kind='stable')]
+        genre_preferences = dict(zip(preferred.tolist(), genre_scores[preferred].tolist()))
+        # Don't keep a vector built while some movie details failed to load
+        if len(details) == len(movie_ids):
+            cache.set(cache_key, genre_preferences, USER_GENRE_PREFERENCES_TTL)
+        
+        return genre_preferences
     
     def _find_similar_users(self, user: User, limit: int = 10) -> List[Tuple[int, float]]:
-        """Find users with similar preferences using collaborative filtering"""
+        """
+        Find users with similar tastes, read from the precomputed UserSimilarity
+        table. Users without stored neighbours have theirs computed and stored
+        on demand; users with fewer than two rated movies, or found to have no
+        neighbours within the last NO_SIMILAR_USERS_TTL, get none.
+        """
         
-        user_favorites = set(
-            UserFavorite.objects.filter(user=user).values_list('movie_id', flat=True)
+        similar_users = list(
+            UserSimilarity.objects.filter(user1=user)
+            .order_by('-similarity_score', 'user2_id')
+            .values_list('user2_id', 'similarity_score')[:limit]
         )
+        if similar_users:
+            return similar_users
         
-        if not user_favorites:
+        no_similar_key = NO_SIMILAR_USERS_CACHE_KEY.format(user.pk)
+        if cache.get(no_similar_key):
             return []
         
-        # Get all users with favorites
-        other_users_favorites = defaultdict(set)
+        rated_movies = set(
+            SimpleFavorite.objects.filter(user=user).values_list('movie_id', flat=True)[:2]
+        )
+        rated_movies.update(
+            SimpleViewingHistory.objects.filter(user=user).values_list('movie_id', flat=True)[:2]
+        )
+        if len(rated_movies) < 2:
+            return []
         
-        for favorite in UserFavorite.objects.exclude(user=user).select_related('user'):
-            other_users_favorites[favorite.user.id].add(favorite.movie_id)
+        pairs, ratings = self._load_centered_ratings()
+        similar_users = self._rank_similar_users(user.pk, pairs, ratings, SIMILAR_USERS_STORED)
+        if not similar_users:
+            cache.set(no_similar_key, True, NO_SIMILAR_USERS_TTL)
+            return []
+        self._store_similar_users(
+            [UserSimilarity(user1_id=user.pk, user2_id=other_id, similarity_score=score)
+             for other_id, score in similar_users]
+        )
+        return similar_users[:limit]
+    
+    def _load_centered_ratings(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load every user's movie ratings for similarity calculations.
         
-        # Calculate Jaccard similarity
-        similarities = []
+        Favorites count as a 10/10 rating and viewing history contributes its
+        rating (5 when unrated). Ratings are centered on the neutral 5/10 rather
+        than on each user's mean, which would turn favorites-only profiles into
+        zero vectors; disliked movies still pull similarity down.
         
-        for other_user_id, other_favorites in other_users_favorites.items():
-            if len(other_favorites) < 2:  # Skip users with very few favorites
-                continue
-            
-            intersection = len(user_favorites.intersection(other_favorites))
-            union = len(user_favorites.union(other_favorites))
-            
-            if union > 0:
-                similarity = intersection / union
-                if similarity > 0.1:  # Only include users with some similarity
-                    similarities.append((other_user_id, similarity))
+        Returns (user_id, movie_id) rows ordered by user then movie, and the
+        centered rating of each row.
+        """
+        
+        # (user, movie, rating) rows for every user, streamed from the cursor
+        # straight into the array; favorites come last so they take precedence
+        # over viewing history for the same movie
+        history = SimpleViewingHistory.objects.order_by('watched_at').values_list(
+            'user_id', 'movie_id', Coalesce('rating', Value(5))
+        )
+        favorites = SimpleFavorite.objects.values_list('user_id', 'movie_id', Value(10))
+        rows = np.fromiter(
+            chain.from_iterable(
+                chain(history.iterator(chunk_size=2000), favorites.iterator(chunk_size=2000))
+            ),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        
+        # Keep the last rating of each (user, movie) pair, ordered by user
+        _, last = np.unique(rows[::-1, :2], axis=0, return_index=True)
+        rows = rows[::-1][last]
+        return rows[:, :2], rows[:, 2] / 10.0 - 0.5
+    
+    def _rank_similar_users(
+        self, user_id: int, pairs: np.ndarray, ratings: np.ndarray, limit: int
+    ) -> List[Tuple[int, float]]:
+        """Rank other users by cosine similarity of their centered ratings to user_id's"""
+        
+        is_user = pairs[:, 0] == user_id
+        target_movies = pairs[is_user, 1]  # sorted, as rows are ordered by movie
+        target_ratings = ratings[is_user]
+        target_norm = np.sqrt(np.dot(target_ratings, target_ratings))
+        if not target_norm:
+            return []
+        
+        others = ~is_user
+        user_ids, user_index = np.unique(pairs[others, 0], return_inverse=True)
+        movies = pairs[others, 1]
+        ratings = ratings[others]
+        
+        # Dot products with the user's vector for every other user at once:
+        # look each rating's movie up in the user's ratings and sum per user
+        position = np.minimum(np.searchsorted(target_movies, movies), len(target_movies) - 1)
+        shared = target_movies[position] == movies
+        dot = np.bincount(
+            user_index[shared],
+            weights=ratings[shared] * target_ratings[position[shared]],
+            minlength=len(user_ids),
+        )
+        norms = np.sqrt(np.bincount(user_index, weights=ratings ** 2, minlength=len(user_ids)))
+        similarity = np.divide(
+            dot, norms * target_norm, out=np.zeros(len(user_ids)), where=norms > 0
+        )
+        # Rounding can push identical profiles just past 1.0
+        np.minimum(similarity, 1.0, out=similarity)
+        sizes = np.bincount(user_index, minlength=len(user_ids))
+        
+        # Skip users with very few ratings; only include users with some similarity
+        candidates = np.flatnonzero((sizes >= 2) & (similarity > 0.1))
         
         # Sort by similarity and return top users
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:limit]
+        order = np.argsort(-similarity[candidates], kind='stable')[:limit]
+        return [
+            (int(user_ids[idx]), float(similarity[idx]))
+            for idx in candidates[order]
+        ]
     
-    def _calculate_content_score(self, movie: Dict, user_genre_preferences: Dict[int, float]) -> float:
-        """Calculate content-based recommendation score for a movie"""
+    def _rank_all_similar_users(
+        self, pairs: np.ndarray, ratings: np.ndarray, limit: int
+    ) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+        """
+        Rank every user's most similar users, applying the same rules as
+        _rank_similar_users.
         
-        score = 0.0
+        Ratings are laid out as a dense user x movie matrix with unit-length
+        rows, so a block of users' cosine similarities to everyone is a single
+        matrix product. Yields (user_id, [(other_user_id, similarity), ...]).
+        """
         
-        # Genre match score
-        movie_genres = movie.get('genre_ids', [])
-        for genre_id in movie_genres:
-            if genre_id in user_genre_preferences:
-                score += user_genre_preferences[genre_id]
+        user_ids, user_index = np.unique(pairs[:, 0], return_inverse=True)
+        _, movie_index = np.unique(pairs[:, 1], return_inverse=True)
+        if not len(user_ids):
+            return
+        
+        matrix = np.zeros((len(user_ids), movie_index.max() + 1), dtype=np.float32)
+        matrix[user_index, movie_index] = ratings
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        
+        # Skip users with very few ratings: only the rest are scored as
+        # neighbours. A movie rated by a single user adds nothing to the dot
+        # product of two different users, so once rows are normalised only
+        # movies with several raters are kept in the product.
+        candidates = np.flatnonzero(np.bincount(user_index, minlength=len(user_ids)) >= 2)
+        matrix = matrix[:, np.bincount(movie_index) >= 2]
+        if not len(candidates):
+            for user_id in user_ids.tolist():
+                yield user_id, []
+            return
+        neighbours_t = np.ascontiguousarray(matrix[candidates].T)
+        k = min(limit, len(candidates))
+        
+        for start in range(0, len(user_ids), SIMILARITY_BLOCK_SIZE):
+            block_users = np.arange(start, min(start + SIMILARITY_BLOCK_SIZE, len(user_ids)))
+            similarity = matrix[block_users] @ neighbours_t
+            # A user is not their own neighbour
+            position = np.minimum(np.searchsorted(candidates, block_users), len(candidates) - 1)
+            is_self = candidates[position] == block_users
+            similarity[is_self.nonzero()[0], position[is_self]] = 0
+            # Rounding can push identical profiles just past 1.0
+            np.minimum(similarity, 1.0, out=similarity)
+            
+            # Each row's k-th best score; users tied with it are kept too so
+            # ties are broken by user id, as in _rank_similar_users
+            kth_scores = -np.partition(-similarity, k - 1, axis=1)[:, k - 1]
+            
+            for row, user in enumerate(block_users):
+                # Only include users with some similarity, best first
+                others = np.flatnonzero(
+                    (similarity[row] >= kth_scores[row]) & (similarity[row] > 0.1)
+                )
+                scores = similarity[row, others]
+                order = np.lexsort((others, -scores))[:limit]
+                yield int(user_ids[user]), [
+                    (int(user_ids[candidates[other]]), float(score))
+                    for other, score in zip(others[order], scores[order])
+                ]
+    
+    @staticmethod
+    def _store_similar_users(similarities: List[UserSimilarity]):
+        """Insert or update UserSimilarity rows in a single statement"""
+        UserSimilarity.objects.bulk_create(
+            similarities,
+            update_conflicts=True,
+            unique_fields=['user1', 'user2'],
+            update_fields=['similarity_score', 'last_updated'],
+        )
+    
+    def _calculate_content_scores(self, movies: List[Dict], user_genre_preferences: Dict[int, float]) -> np.ndarray:
+        """Calculate content-based recommendation scores for several movies"""
+        
+        # Genre match score: the sum of the user's preference for each of a
+        # movie's genres, i.e. a sparse movie x genre matrix times the
+        # preference vector, accumulated per movie with bincount
+        rows = []
+        weights = []
+        for row, movie in enumerate(movies):
+            for genre_id in movie.get('genre_ids', []):
+                if genre_id in user_genre_preferences:
+                    rows.append(row)
+                    weights.append(user_genre_preferences[genre_id])
+        genre_scores = np.bincount(rows, weights=weights, minlength=len(movies))
         
         # Popularity and rating boost
-        popularity_score = min(movie.get('popularity', 0) / 1000, 1.0)
-        rating_score = movie.get('vote_average', 0) / 10.0
+        popularity = np.fromiter((movie.get('popularity', 0) for movie in movies), dtype=float, count=len(movies))
+        ratings = np.fromiter((movie.get('vote_average', 0) for movie in movies), dtype=float, count=len(movies))
+        popularity_scores = np.minimum(popularity / 1000, 1.0)
+        rating_scores = ratings / 10.0
         
-        score = score + (popularity_score * 0.3) + (rating_score * 0.7)
-        
-        return score
+        return genre_scores + (popularity_scores * 0.3) + (rating_scores * 0.7)
     
     def _get_genre_name(self, genre_id: int) -> str:
         """Get genre name from ID (cached)"""
-        cache_key = f"genre_name_{genre_id}"
-        genre_name = cache.get(cache_key)
-        
-        if not genre_name:
-            try:
-                genres = self.movie_service.get_genres()
-                for genre in genres.get('genres', []):
-                    if genre['id'] == genre_id:
-                        genre_name = genre['name']
-                        cache.set(cache_key, genre_name, 86400)  # Cache for 24 hours
-                        break
-            except Exception:
-                genre_name = "Unknown Genre"
-        
-        return genre_name or "Unknown Genre"
+        return self._get_genre_map().get(genre_id, "Unknown Genre")
+    
+    def _get_genre_map(self) -> Dict[int, str]:
+        """Get the TMDb genre ID to name map, cached for 24 hours"""
+        if self._genre_map is None:
+            genre_map = cache.get('tmdb_genre_map')
+            if genre_map is None:
+                try:
+                    genres = self.tmdb_client.get_genres()
+                except Exception as e:
+                    logger.warning(f"Could not load genres: {e}")
+                    return {}
+                genre_map = {genre['id']: genre['name'] for genre in genres.get('genres', [])}
+                cache.set('tmdb_genre_map', genre_map, 86400)  # Cache for 24 hours
+            self._genre_map = genre_map
+        return self._genre_map
     
     def _get_popular_movies(self, limit: int = 20) -> List[Dict]:
         """Fallback to popular movies when no user data is available"""
@@ -425,6 +786,12 @@ class RecommendationEngine:
     
     def _get_user_settings(self, user: User) -> RecommendationSettings:
         """Get or create user recommendation settings"""
+        # The reverse one-to-one accessor caches the row on the user instance,
+        # so repeat calls within a request do not query again
+        try:
+            return user.recommendation_settings
+        except RecommendationSettings.DoesNotExist:
+            pass
         settings, created = RecommendationSettings.objects.get_or_create(
             user=user,
             defaults={
@@ -441,12 +808,13 @@ class RecommendationEngine:
         )
         return settings
     
-    def _apply_user_filters(self, recommendations: List[Dict], settings: RecommendationSettings) -> List[Dict]:
-        """Apply user preference filters to recommendations"""
+    def _apply_user_filters(self, recommendations: List[Dict], settings: RecommendationSettings) -> Iterator[Dict]:
+        """Yield the recommendations that pass the user's preference filters"""
         
-        filtered_recommendations = []
         current_year = datetime.now().year
         min_year = current_year - settings.release_year_range
+        min_vote_average = settings.min_vote_average
+        min_vote_count = settings.min_vote_count
         
         for movie in recommendations:
             # Year filter
@@ -460,42 +828,44 @@ class RecommendationEngine:
                     pass
             
             # Rating filters
-            if movie.get('vote_average', 0) < settings.min_vote_average:
+            if movie.get('vote_average', 0) < min_vote_average:
                 continue
             
-            if movie.get('vote_count', 0) < settings.min_vote_count:
+            if movie.get('vote_count', 0) < min_vote_count:
                 continue
             
-            filtered_recommendations.append(movie)
-        
-        return filtered_recommendations
+            yield movie
     
     def _get_cached_recommendations(self, user: User, recommendation_type: str) -> Optional[List[Dict]]:
         """Get cached recommendations if they exist and are not expired"""
         
-        try:
-            cache_entry = RecommendationCache.objects.get(
-                user=user,
-                recommendation_type=recommendation_type,
-                expires_at__gt=timezone.now()
-            )
-            
-            # Get movie details for cached IDs
-            recommendations = []
-            for movie_id in cache_entry.movie_ids:
-                try:
-                    movie_data = self.movie_service.get_movie_details(movie_id)
-                    # Add cached score if available
-                    if cache_entry.scores and str(movie_id) in cache_entry.scores:
-                        movie_data['recommendation_score'] = cache_entry.scores[str(movie_id)]
-                    recommendations.append(movie_data)
-                except Exception:
-                    continue
-            
-            return recommendations
-            
-        except RecommendationCache.DoesNotExist:
+        # Read the JSON columns as a tuple; no model instance is needed
+        entry = RecommendationCache.objects.filter(
+            user=user,
+            recommendation_type=recommendation_type,
+            version=recommendation_cache_version(user.id),
+            expires_at__gt=timezone.now()
+        ).values_list('movie_ids', 'scores').first()
+        
+        # Scores are [score, reason] pairs in the same order as movie_ids;
+        # rows in any other shape are treated as a miss
+        if entry is None or not isinstance(entry[1], list) or len(entry[1]) != len(entry[0]):
             return None
+        movie_ids, scores = entry
+        
+        # Get movie details for cached IDs in one batch; movies that fail
+        # to load are skipped
+        details = self._get_movie_details_bulk(movie_ids)
+        recommendations = []
+        for movie_id, (score, reason) in zip(movie_ids, scores):
+            movie_data = details.get(movie_id)
+            if movie_data is None:
+                continue
+            movie_data['recommendation_score'] = score
+            movie_data['recommendation_reason'] = reason
+            recommendations.append(movie_data)
+        
+        return recommendations
     
     def _cache_recommendations(
         self, 
@@ -507,17 +877,26 @@ class RecommendationEngine:
         """Cache recommendations for future use"""
         
         movie_ids = [movie['id'] for movie in recommendations]
-        scores = {str(movie['id']): movie.get('recommendation_score', 0) for movie in recommendations}
+        scores = [
+            [movie.get('recommendation_score', 0), movie.get('recommendation_reason', '')]
+            for movie in recommendations
+        ]
         
         expires_at = timezone.now() + timedelta(hours=settings.cache_duration_hours)
         
-        # Update or create cache entry
-        RecommendationCache.objects.update_or_create(
-            user=user,
-            recommendation_type=recommendation_type,
-            defaults={
-                'movie_ids': movie_ids,
-                'scores': scores,
-                'expires_at': expires_at,
-            }
+        # Update or create cache entry in a single INSERT ... ON CONFLICT
+        RecommendationCache.objects.bulk_create(
+            [
+                RecommendationCache(
+                    user=user,
+                    recommendation_type=recommendation_type,
+                    movie_ids=movie_ids,
+                    scores=scores,
+                    expires_at=expires_at,
+                    version=recommendation_cache_version(user.id),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=['user', 'recommendation_type'],
+            update_fields=['movie_ids', 'scores', 'expires_at', 'version'],
         )
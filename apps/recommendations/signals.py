@@ -0,0 +1,53 @@
+"""
+Signal handlers for the recommendations app.
+
+Stored recommendations are invalidated when a user's favorites or feedback
+change, and cached genre preferences when their favorites or viewing history
+change, so the next request is generated from fresh data rather than waiting
+for the cache TTL.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .basic_engine import bump_recommendation_version, forget_recent_recommendations
+from .models import (
+    RecommendationCache,
+    RecommendationFeedback,
+    SimpleFavorite,
+    SimpleViewingHistory,
+)
+from .services import forget_user_genre_preferences
+
+
+def invalidate_user_recommendations(user_id):
+    """Drop a user's cached recommendations, returning the rows deleted"""
+    deleted = RecommendationCache.objects.filter(user_id=user_id).delete()[0]
+    expire_user_recommendations(user_id)
+    return deleted
+
+
+def expire_user_recommendations(user_id):
+    """Stop serving a user's cached recommendations without deleting them"""
+    # Entries stored under the old version are no longer read and run out
+    # through their TTL
+    bump_recommendation_version(user_id)
+    forget_recent_recommendations(user_id)
+
+
+@receiver(post_save, sender=SimpleFavorite)
+@receiver(post_delete, sender=SimpleFavorite)
+@receiver(post_save, sender=RecommendationFeedback)
+@receiver(post_delete, sender=RecommendationFeedback)
+def _invalidate_recommendations(sender, instance, **kwargs):
+    """Invalidate recommendations when favorites or feedback change."""
+    invalidate_user_recommendations(instance.user_id)
+
+
+@receiver(post_save, sender=SimpleFavorite)
+@receiver(post_delete, sender=SimpleFavorite)
+@receiver(post_save, sender=SimpleViewingHistory)
+@receiver(post_delete, sender=SimpleViewingHistory)
+def _invalidate_genre_preferences(sender, instance, **kwargs):
+    """Invalidate genre preferences when favorites or viewing history change."""
+    forget_user_genre_preferences(instance.user_id)
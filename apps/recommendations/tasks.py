@@ -0,0 +1,101 @@
+"""
+Background tasks for the recommendations app.
+
+Heavy recommendation computation runs here so request handlers only read
+cached results.
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .advanced_engine import AdvancedRecommendationEngine
+from .basic_engine import BasicRecommendationEngine
+from .models import RecommendationCache
+from .services import RecommendationEngine
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Users who logged in within this window get precomputed recommendations
+ACTIVE_USER_WINDOW = timedelta(days=7)
+
+# RecommendationCache rows expired for longer than this are purged
+EXPIRED_CACHE_GRACE = timedelta(days=1)
+PURGE_BATCH_SIZE = 10000
+
+
+@shared_task(ignore_result=True)
+def precompute_recommendations(
+    user_id,
+    recommendation_type="hybrid",
+    limit=AdvancedRecommendationEngine.PRECOMPUTE_LIMIT,
+):
+    """Compute and cache advanced recommendations for one user"""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return []
+
+    engine = AdvancedRecommendationEngine()
+    return engine.precompute_recommendations(user, recommendation_type, limit)
+
+
+@shared_task(ignore_result=True)
+def refresh_recommendations(user_id, recommendation_type="hybrid", limit=20):
+    """Regenerate a user's stale basic recommendations"""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return []
+
+    engine = BasicRecommendationEngine()
+    return engine.get_recommendations(
+        user, recommendation_type, limit, force_refresh=True
+    )
+
+
+@shared_task(ignore_result=True)
+def precompute_active_user_recommendations():
+    """Queue hybrid recommendation precomputation for recently active users"""
+    active_since = timezone.now() - ACTIVE_USER_WINDOW
+    user_ids = User.objects.filter(
+        is_active=True, last_login__gte=active_since
+    ).values_list("id", flat=True)
+
+    queued = 0
+    for user_id in user_ids.iterator():
+        precompute_recommendations.delay(user_id)
+        queued += 1
+
+    logger.info(f"Queued recommendation precomputation for {queued} active users")
+    return queued
+
+
+@shared_task(ignore_result=True)
+def purge_expired_recommendation_cache():
+    """Delete RecommendationCache rows that expired more than a day ago"""
+    expired = RecommendationCache.objects.filter(
+        expires_at__lt=timezone.now() - EXPIRED_CACHE_GRACE
+    )
+
+    # Delete in bounded batches so no single statement holds locks for long
+    deleted = 0
+    while True:
+        batch_ids = list(expired.values_list("id", flat=True)[:PURGE_BATCH_SIZE])
+        if not batch_ids:
+            break
+        deleted += RecommendationCache.objects.filter(id__in=batch_ids).delete()[0]
+
+    logger.info(f"Purged {deleted} expired recommendation cache rows")
+    return deleted
+
+
+@shared_task(ignore_result=True)
+def refresh_user_similarities():
+    """Recompute every user's stored nearest neighbours"""
+    stored = RecommendationEngine().refresh_user_similarities()
+
+    logger.info(f"Stored {stored} user similarity rows")
+    return stored
@@ -1,3 +1,316 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .advanced_engine import AdvancedRecommendationEngine
+from .basic_engine import (
+    BasicRecommendationEngine,
+    forget_recent_recommendations,
+    recommendation_cache_key,
+    recommendation_cache_version,
+)
+from .models import RecommendationFeedback, SimpleFavorite, SimpleViewingHistory
+from .serializers import ADVANCED_RECOMMENDATION_TYPES
+
+User = get_user_model()
+
+
+def _list_result(movie_id):
+    """A TMDb list result, as returned by trending/popular endpoints"""
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "overview": "An overview.",
+        "poster_path": f"/poster{movie_id}.jpg",
+        "backdrop_path": f"/backdrop{movie_id}.jpg",
+        "release_date": "2020-01-01",
+        "vote_average": 7.5,
+        "vote_count": 1200,
+        "popularity": 85.3,
+        "genre_ids": [18, 35],
+    }
+
+
+def _movie_details(movie_id):
+    """A TMDb /movie/{id} payload, which has genres instead of genre_ids"""
+    details = _list_result(movie_id)
+    del details["genre_ids"]
+    details.update(
+        {
+            "genres": [{"id": 18, "name": "Drama"}, {"id": 35, "name": "Comedy"}],
+            "runtime": 120,
+            "credits": {"cast": [], "crew": []},
+            "videos": {"results": []},
+        }
+    )
+    return details
+
+
+def _fake_tmdb_client():
+    client = mock.Mock()
+    movie_list = {"page": 1, "results": [_list_result(i) for i in range(500, 520)]}
+    client.get_trending_movies.return_value = movie_list
+    client.get_popular_movies.return_value = movie_list
+    client.get_movie_recommendations.return_value = movie_list
+    client.get_similar_movies.return_value = movie_list
+    client.get_movie_details.side_effect = _movie_details
+    client.get_movie_details_bulk.side_effect = lambda movie_ids: {
+        movie_id: _movie_details(movie_id) for movie_id in movie_ids
+    }
+    return client
+
+
+def _create_users_with_interactions():
+    """A user and a neighbour with overlapping favorites and history"""
+    user = User.objects.create_user(
+        email="viewer@example.com", username="viewer", password="secret"
+    )
+    other = User.objects.create_user(
+        email="other@example.com", username="other", password="secret"
+    )
+    now = timezone.now()
+    for movie_id in (1, 2, 3):
+        SimpleFavorite.objects.create(user=user, movie_id=movie_id)
+    for movie_id in (1, 2, 3, 4, 5, 6):
+        SimpleFavorite.objects.create(user=other, movie_id=movie_id)
+    for movie_id in (4, 7):
+        SimpleViewingHistory.objects.create(
+            user=user, movie_id=movie_id, rating=8, watched_at=now
+        )
+        SimpleViewingHistory.objects.create(
+            user=other, movie_id=movie_id + 10, rating=9, watched_at=now
+        )
+    return user
+
+
+def _patch_tmdb_client(test_case, module):
+    patcher = mock.patch(f"{module}.get_tmdb_client", return_value=_fake_tmdb_client())
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+class AdvancedRecommendationSerializationTests(TransactionTestCase):
+    """
+    Every advanced recommendation type renders through the list view.
+
+    Hybrid and ensemble types run algorithms on worker threads, which only
+    see committed rows, hence TransactionTestCase.
+    """
+
+    def setUp(self):
+        self.user = _create_users_with_interactions()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        _patch_tmdb_client(self, "apps.recommendations.advanced_engine")
+
+    def test_each_advanced_type_serializes(self):
+        url = reverse("recommendations:recommendations-list")
+        for recommendation_type in ADVANCED_RECOMMENDATION_TYPES:
+            with self.subTest(recommendation_type=recommendation_type):
+                response = self.client.get(
+                    url,
+                    {
+                        "algorithm": "advanced",
+                        "type": recommendation_type,
+                        "force_refresh": "true",
+                    },
+                )
+                self.assertEqual(response.status_code, 200, response.content)
+                recommendations = response.json()["recommendations"]
+                self.assertTrue(recommendations)
+                for movie in recommendations:
+                    self.assertEqual(movie["genre_ids"], [18, 35])
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class AdvancedRecommendationInvalidationTests(TestCase):
+    """Cached advanced recommendations follow the user's cache version"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = _create_users_with_interactions()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        _patch_tmdb_client(self, "apps.recommendations.advanced_engine")
+
+        compute = AdvancedRecommendationEngine._compute_recommendations
+        patcher = mock.patch.object(
+            AdvancedRecommendationEngine,
+            "_compute_recommendations",
+            autospec=True,
+            side_effect=compute,
+        )
+        self.compute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_recommendations(self):
+        response = self.client.get(
+            reverse("recommendations:recommendations-list"),
+            {"algorithm": "advanced", "type": "matrix_factorization"},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_favorite_change_recomputes(self):
+        self.get_recommendations()
+        self.get_recommendations()
+        self.assertEqual(self.compute.call_count, 1)
+
+        SimpleFavorite.objects.create(user=self.user, movie_id=8)
+        self.get_recommendations()
+        self.assertEqual(self.compute.call_count, 2)
+
+
+class RecommendationFeedbackListTests(TestCase):
+    """A list of feedback is upserted in one statement"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="viewer@example.com", username="viewer", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("recommendations:recommendations-feedback")
+
+    def stored_feedback(self):
+        return dict(
+            RecommendationFeedback.objects.filter(user=self.user).values_list(
+                "movie_id", "feedback"
+            )
+        )
+
+    def test_list_creates_and_updates_feedback(self):
+        RecommendationFeedback.objects.create(
+            user=self.user, movie_id=1, recommendation_type="hybrid", feedback="like"
+        )
+
+        response = self.client.post(
+            self.url,
+            [
+                {"movie_id": 1, "recommendation_type": "hybrid", "feedback": "dislike"},
+                {"movie_id": 2, "recommendation_type": "hybrid", "feedback": "like"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(self.stored_feedback(), {1: "dislike", 2: "like"})
+
+    def test_last_duplicate_wins(self):
+        response = self.client.post(
+            self.url,
+            [
+                {"movie_id": 3, "recommendation_type": "hybrid", "feedback": "like"},
+                {"movie_id": 3, "recommendation_type": "hybrid", "feedback": "watched"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item["feedback"] for item in response.json()], ["watched"])
+        self.assertEqual(self.stored_feedback(), {3: "watched"})
+
+    def test_invalid_item_rejects_the_list(self):
+        response = self.client.post(
+            self.url,
+            [
+                {"movie_id": 4, "recommendation_type": "hybrid", "feedback": "like"},
+                {"movie_id": -1, "recommendation_type": "hybrid", "feedback": "like"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(RecommendationFeedback.objects.exists())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class BasicRecommendationInvalidationTests(TestCase):
+    """
+    Changing settings or favorites bypasses every layer caching basic
+    recommendations: the in-process LRU, the shared cache and the database.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = _create_users_with_interactions()
+        self.addCleanup(forget_recent_recommendations, self.user.id)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        client = _fake_tmdb_client()
+        client.discover_movies.return_value = {
+            "page": 1,
+            "results": [_list_result(i) for i in range(600, 620)],
+        }
+        patcher = mock.patch(
+            "apps.recommendations.basic_engine.get_tmdb_client", return_value=client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        compute = BasicRecommendationEngine._get_hybrid_recommendations
+        patcher = mock.patch.object(
+            BasicRecommendationEngine,
+            "_get_hybrid_recommendations",
+            autospec=True,
+            side_effect=compute,
+        )
+        self.compute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_recommendations(self):
+        response = self.client.get(
+            reverse("recommendations:recommendations-list"),
+            {"type": "hybrid", "limit": 10},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def assert_served_from_each_cache(self):
+        self.assertFalse(self.get_recommendations()["cached"])
+
+        # In-process LRU
+        self.assertTrue(self.get_recommendations()["cached"])
+
+        # Shared cache
+        forget_recent_recommendations(self.user.id)
+        self.assertTrue(self.get_recommendations()["cached"])
+
+        # Database
+        forget_recent_recommendations(self.user.id)
+        version = recommendation_cache_version(self.user.id)
+        cache.delete(recommendation_cache_key(self.user.id, "hybrid", version))
+        self.assertTrue(self.get_recommendations()["cached"])
+
+        self.assertEqual(self.compute.call_count, 1)
+
+    def test_settings_patch_recomputes(self):
+        self.assert_served_from_each_cache()
+
+        response = self.client.patch(
+            reverse("recommendations:recommendations-settings"),
+            {"min_vote_count": 50},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertFalse(self.get_recommendations()["cached"])
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_new_favorite_recomputes(self):
+        self.assert_served_from_each_cache()
+
+        SimpleFavorite.objects.create(user=self.user, movie_id=8)
+
+        self.assertFalse(self.get_recommendations()["cached"])
+        self.assertEqual(self.compute.call_count, 2)
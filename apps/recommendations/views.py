@@ -5,7 +5,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Avg, Count
+from django.db import transaction
+from django.db.models import Avg, Count, Q
 from django.core.cache import cache
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
@@ -23,14 +24,24 @@ from .serializers import (
     RecommendationListSerializer,
     RecommendationAnalyticsSerializer,
     RecommendationRequestSerializer,
+    RecommendationQuerySerializer,
+    ADVANCED_RECOMMENDATION_TYPES,
     UserSimilaritySerializer,
     MovieSimilaritySerializer,
 )
 from .basic_engine import BasicRecommendationEngine
+from .signals import expire_user_recommendations, invalidate_user_recommendations
 from .advanced_engine import AdvancedRecommendationEngine
 
 User = get_user_model()
 
+# Analytics responses are cached per user for this many seconds
+ANALYTICS_CACHE_TIMEOUT = 5 * 60
+
+# Types each engine serves directly; anything else falls back to hybrid
+_BASIC_ENGINE_TYPES = frozenset(("trending", "content", "hybrid"))
+_ADVANCED_ENGINE_TYPES = frozenset(ADVANCED_RECOMMENDATION_TYPES)
+
 
 class RecommendationListView(APIView):
     """Get personalized movie recommendations for authenticated user"""
@@ -67,73 +78,30 @@ class RecommendationListView(APIView):
     def get(self, request):
         """Get recommendations for the authenticated user"""
 
-        # Parse query parameters
-        recommendation_type = request.query_params.get("type", "hybrid")
-        limit = int(request.query_params.get("limit", 20))
-        force_refresh = (
-            request.query_params.get("force_refresh", "false").lower() == "true"
-        )
-        algorithm = request.query_params.get(
-            "algorithm", "basic"
-        )  # 'basic' or 'advanced'
-
-        # Validate parameters based on algorithm type
-        if algorithm == "advanced":
-            valid_types = [
-                "matrix_factorization",
-                "neural_cf",
-                "content_based_advanced",
-                "collaborative_knn",
-                "sequential",
-                "ensemble",
-                "hybrid",
-                "trending",
-                "content",  # Also support basic types
-            ]
-        else:
-            valid_types = ["content", "collaborative", "hybrid", "trending", "similar"]
-
-        if recommendation_type not in valid_types:
-            return Response(
-                {
-                    "error": f'Invalid recommendation type for {algorithm} algorithm. Must be one of: {", ".join(valid_types)}'
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # Parse and validate query parameters
+        query = RecommendationQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            # Report the first problem as a single message
+            message = next(iter(query.errors.values()))[0]
+            return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not 1 <= limit <= 100:
-            return Response(
-                {"error": "Limit must be between 1 and 100"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        recommendation_type = query.validated_data["type"]
+        limit = query.validated_data["limit"]
+        force_refresh = query.validated_data["force_refresh"]
+        algorithm = query.validated_data["algorithm"]  # 'basic' or 'advanced'
 
         try:
             # Choose engine based on algorithm parameter
             if algorithm == "advanced":
                 engine = AdvancedRecommendationEngine()
-                # Validate advanced algorithm types
-                advanced_types = [
-                    "matrix_factorization",
-                    "neural_cf",
-                    "content_based_advanced",
-                    "collaborative_knn",
-                    "sequential",
-                    "ensemble",
-                    "hybrid",
-                ]
-                if (
-                    recommendation_type not in advanced_types
-                    and recommendation_type not in ["trending", "content"]
-                ):
+                if recommendation_type not in _ADVANCED_ENGINE_TYPES:
                     recommendation_type = "hybrid"
             else:
                 engine = BasicRecommendationEngine()
-                # Basic engine supports: trending, content, hybrid
-                if recommendation_type not in ["trending", "content", "hybrid"]:
+                if recommendation_type not in _BASIC_ENGINE_TYPES:
                     recommendation_type = "hybrid"
 
             # Get recommendations using the engine
-            engine = BasicRecommendationEngine()
             recommendations = engine.get_recommendations(
                 user=request.user,
                 recommendation_type=recommendation_type,
@@ -141,9 +109,11 @@ class RecommendationListView(APIView):
                 force_refresh=force_refresh,
             )
 
-            # Check if recommendations came from cache
-            cached = not force_refresh and self._check_cache_hit(
-                request.user, recommendation_type
+            # The basic engine reports whether it served a cached result
+            cached = getattr(engine, "served_from_cache", False)
+            # The advanced engine serves trending movies while it computes
+            recommendation_type = (
+                getattr(engine, "served_type", None) or recommendation_type
             )
 
             # Prepare response data
@@ -164,18 +134,6 @@ class RecommendationListView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _check_cache_hit(self, user, recommendation_type):
-        """Check if recommendations came from cache"""
-        try:
-            cache_entry = RecommendationCache.objects.get(
-                user=user,
-                recommendation_type=recommendation_type,
-                expires_at__gt=timezone.now(),
-            )
-            return True
-        except RecommendationCache.DoesNotExist:
-            return False
-
 
 class RecommendationSettingsView(generics.RetrieveUpdateAPIView):
     """Get and update user recommendation settings"""
@@ -214,9 +172,10 @@ class RecommendationSettingsView(generics.RetrieveUpdateAPIView):
         description="Update user recommendation settings",
     )
     def patch(self, request, *args, **kwargs):
-        # Clear recommendation cache when settings are updated
-        RecommendationCache.objects.filter(user=request.user).delete()
-        return super().patch(request, *args, **kwargs)
+        response = super().patch(request, *args, **kwargs)
+        # Recommendations cached under the old settings are no longer served
+        expire_user_recommendations(request.user.id)
+        return response
 
 
 class RecommendationFeedbackView(APIView):
@@ -227,38 +186,64 @@ class RecommendationFeedbackView(APIView):
     @extend_schema(
         request=RecommendationFeedbackSerializer,
         responses={201: RecommendationFeedbackSerializer},
-        description="Submit feedback on a recommendation",
+        description=(
+            "Submit feedback on a recommendation. A list of feedback objects "
+            "may be sent to record several at once."
+        ),
     )
     def post(self, request):
         """Submit feedback on a recommendation"""
 
+        if isinstance(request.data, list):
+            return self._post_many(request)
+
         serializer = RecommendationFeedbackSerializer(data=request.data)
         if serializer.is_valid():
-            # Check if feedback already exists
-            existing_feedback = RecommendationFeedback.objects.filter(
+            # Create the feedback or update the existing entry; the unique
+            # (user, movie_id, recommendation_type) constraint backs the lookup
+            feedback, created = RecommendationFeedback.objects.update_or_create(
                 user=request.user,
                 movie_id=serializer.validated_data["movie_id"],
                 recommendation_type=serializer.validated_data["recommendation_type"],
-            ).first()
-
-            if existing_feedback:
-                # Update existing feedback
-                existing_feedback.feedback = serializer.validated_data["feedback"]
-                existing_feedback.save()
-                response_serializer = RecommendationFeedbackSerializer(
-                    existing_feedback
-                )
-                return Response(response_serializer.data, status=status.HTTP_200_OK)
-            else:
-                # Create new feedback
-                feedback = serializer.save(user=request.user)
-                response_serializer = RecommendationFeedbackSerializer(feedback)
-                return Response(
-                    response_serializer.data, status=status.HTTP_201_CREATED
-                )
+                defaults={"feedback": serializer.validated_data["feedback"]},
+            )
+            response_serializer = RecommendationFeedbackSerializer(feedback)
+            return Response(
+                response_serializer.data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            )
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def _post_many(self, request):
+        """Create or update several feedback entries with one upsert"""
+        serializer = RecommendationFeedbackSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # One row per (movie, type); the last submitted feedback wins, since a
+        # single upsert statement cannot touch the same row twice
+        feedback_by_key = {
+            (item["movie_id"], item["recommendation_type"]): RecommendationFeedback(
+                user=request.user, **item
+            )
+            for item in serializer.validated_data
+        }
+        feedback = list(feedback_by_key.values())
+
+        with transaction.atomic():
+            RecommendationFeedback.objects.bulk_create(
+                feedback,
+                update_conflicts=True,
+                unique_fields=["user", "movie_id", "recommendation_type"],
+                update_fields=["feedback"],
+            )
+            # bulk_create does not send post_save
+            invalidate_user_recommendations(request.user.id)
+
+        response_serializer = RecommendationFeedbackSerializer(feedback, many=True)
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
 
 class RecommendationAnalyticsView(APIView):
     """Get recommendation analytics and insights"""
@@ -273,17 +258,25 @@ class RecommendationAnalyticsView(APIView):
         """Get analytics data for user's recommendations"""
 
         user = request.user
+        cache_key = f"recommendation_analytics_{user.id}"
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return Response(cached_data, status=status.HTTP_200_OK)
+
+        # Get recommendation counts, including unexpired entries, in one query
+        cache_counts = RecommendationCache.objects.filter(user=user).aggregate(
+            total=Count("id"),
+            live=Count("id", filter=Q(expires_at__gt=timezone.now())),
+        )
+        total_recommendations = cache_counts["total"]
 
-        # Get recommendation counts
-        total_recommendations = RecommendationCache.objects.filter(user=user).count()
-
-        # Get feedback statistics
-        feedback_queryset = RecommendationFeedback.objects.filter(user=user)
-        feedback_count = feedback_queryset.count()
-
-        positive_feedback = feedback_queryset.filter(
-            feedback__in=["like", "watched"]
-        ).count()
+        # Get feedback statistics in one query
+        feedback_counts = RecommendationFeedback.objects.filter(user=user).aggregate(
+            total=Count("id"),
+            positive=Count("id", filter=Q(feedback__in=["like", "watched"])),
+        )
+        feedback_count = feedback_counts["total"]
+        positive_feedback = feedback_counts["positive"]
 
         positive_percentage = (
             (positive_feedback / feedback_count * 100) if feedback_count > 0 else 0
@@ -299,9 +292,8 @@ class RecommendationAnalyticsView(APIView):
         avg_score = 0.75  # Placeholder
 
         # Calculate cache hit rate
-        cache_entries = RecommendationCache.objects.filter(user=user)
-        total_cache_checks = cache_entries.count() * 2  # Estimate
-        cache_hits = cache_entries.filter(expires_at__gt=timezone.now()).count()
+        total_cache_checks = total_recommendations * 2  # Estimate
+        cache_hits = cache_counts["live"]
         cache_hit_rate = (
             (cache_hits / total_cache_checks * 100) if total_cache_checks > 0 else 0
         )
@@ -317,6 +309,7 @@ class RecommendationAnalyticsView(APIView):
         }
 
         serializer = RecommendationAnalyticsSerializer(analytics_data)
+        cache.set(cache_key, serializer.data, ANALYTICS_CACHE_TIMEOUT)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -329,9 +322,12 @@ class RecommendationAnalyticsView(APIView):
 def similar_users_view(request):
     """Get users similar to the authenticated user"""
 
+    # Only the columns the serializer reads are fetched from the joined users
     similar_users = (
-        UserSimilarity.objects.filter(user1=request.user)
-        .select_related("user2")
+        UserSimilaritySerializer.setup_eager_loading(
+            UserSimilarity.objects.filter(user1=request.user)
+        )
+        .only("similarity_score", "last_updated", "user1__email", "user2__email")
         .order_by("-similarity_score")[:10]
     )
 
@@ -373,9 +369,13 @@ def similar_movies_view(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    similar_movies = MovieSimilarity.objects.filter(movie1_id=movie_id).order_by(
-        "-similarity_score"
-    )[:20]
+    # Rows are serialized from plain dicts; the (movie1_id, similarity_score)
+    # index serves both the filter and the ordering
+    similar_movies = (
+        MovieSimilarity.objects.filter(movie1_id=movie_id)
+        .order_by("-similarity_score")
+        .values(*MovieSimilaritySerializer.Meta.fields)[:20]
+    )
 
     serializer = MovieSimilaritySerializer(similar_movies, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -406,7 +406,7 @@ def advanced_recommendations_view(request):
             force_refresh=validated_data["force_refresh"],
         )
 
-        cached = not validated_data["force_refresh"]
+        cached = engine.served_from_cache
 
         response_data = {
             "recommendation_type": validated_data["recommendation_type"],
@@ -419,7 +419,11 @@ def advanced_recommendations_view(request):
         if validated_data["include_metadata"]:
             response_data["metadata"] = {
                 "algorithm_used": validated_data["recommendation_type"],
-                "parameters": validated_data,
+                "parameters": {
+                    "recommendation_type": validated_data["recommendation_type"],
+                    "limit": validated_data["limit"],
+                    "force_refresh": validated_data["force_refresh"],
+                },
                 "user_id": request.user.id,
             }
 
@@ -441,7 +445,7 @@ def advanced_recommendations_view(request):
 def clear_recommendation_cache_view(request):
     """Clear all recommendation cache for the authenticated user"""
 
-    deleted_count = RecommendationCache.objects.filter(user=request.user).delete()[0]
+    deleted_count = invalidate_user_recommendations(request.user.id)
 
     return Response(
         {"message": f"Cleared {deleted_count} cache entries"}, status=status.HTTP_200_OK
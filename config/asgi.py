@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Report errors to Sentry from server processes (see production settings)
+os.environ.setdefault('ENABLE_SENTRY', '1')
 
 application = get_asgi_application()
@@ -6,6 +6,7 @@ The settings are split into:
 - development.py: Development-specific settings
 - production.py: Production-specific settings
 - testing.py: Testing-specific settings
+- _logging.py: LOGGING builder shared by the modules above
 """
 
 import os
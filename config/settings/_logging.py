@@ -0,0 +1,47 @@
+"""
+LOGGING configuration shared by the settings modules.
+
+Each environment passes its handlers and logger levels to build_logging();
+the formatters and the rest of the dictConfig layout are common.
+"""
+
+FORMATTERS = {
+    "verbose": {
+        "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
+        "style": "{",
+    },
+    "simple": {
+        "format": "{levelname} {message}",
+        "style": "{",
+    },
+    "json": {
+        "()": "utils.logging_formatters.JSONFormatter",
+    },
+}
+
+
+def build_logging(*, handlers, root_level, root_handlers, loggers):
+    """
+    Build a LOGGING dict for logging.config.dictConfig.
+
+    ``loggers`` maps logger names to ``(level, handler names)``; named
+    loggers do not propagate to the root logger.
+    """
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {name: dict(spec) for name, spec in FORMATTERS.items()},
+        "handlers": handlers,
+        "root": {
+            "handlers": root_handlers,
+            "level": root_level,
+        },
+        "loggers": {
+            name: {
+                "handlers": logger_handlers,
+                "level": level,
+                "propagate": False,
+            }
+            for name, (level, logger_handlers) in loggers.items()
+        },
+    }
@@ -10,6 +10,8 @@ from pathlib import Path
 from decouple import config
 from datetime import timedelta
 
+from ._logging import build_logging
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -158,10 +160,10 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "utils.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "utils.parsers.ORJSONParser",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -212,6 +214,13 @@ CACHES = {
         "LOCATION": config("REDIS_URL", default="redis://localhost:6379/0"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Shrinks large recommendation payloads; entries written
+            # uncompressed are still read back as is
+            "COMPRESSOR": "django_redis.compressors.lz4.Lz4Compressor",
+            # Python 3.12 pickles with protocol 4 by default; 5 stores large
+            # payloads with less copying, and entries in either protocol load
+            "PICKLE_VERSION": 5,
+            "CONNECTION_POOL_KWARGS": {"max_connections": 50, "retry_on_timeout": True},
         },
         "KEY_PREFIX": "movie_rec",
         "TIMEOUT": 300,  # 5 minutes default timeout
@@ -223,23 +232,12 @@ SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
 # Logging Configuration
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
-        },
-        "simple": {
-            "format": "{levelname} {message}",
-            "style": "{",
-        },
-    },
-    "handlers": {
+LOGGING = build_logging(
+    handlers={
         "file": {
             "level": "INFO",
-            "class": "logging.FileHandler",
+            # Written by a background thread, off the request path
+            "class": "utils.logging_handlers.QueuedRotatingFileHandler",
             "filename": BASE_DIR / "logs" / "django.log",
             "formatter": "verbose",
         },
@@ -249,18 +247,12 @@ LOGGING = {
             "formatter": "simple",
         },
     },
-    "root": {
-        "handlers": ["console", "file"],
-        "level": "INFO",
-    },
-    "loggers": {
-        "django": {
-            "handlers": ["console", "file"],
-            "level": config("DJANGO_LOG_LEVEL", default="INFO"),
-            "propagate": False,
-        },
+    root_level="INFO",
+    root_handlers=["console", "file"],
+    loggers={
+        "django": (config("DJANGO_LOG_LEVEL", default="INFO"), ["console", "file"]),
     },
-}
+)
 
 # API Spectacular Configuration (OpenAPI/Swagger)
 SPECTACULAR_SETTINGS = {
@@ -385,3 +377,19 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Keep hybrid recommendations warm for recently active users
+    "precompute-active-user-recommendations": {
+        "task": "apps.recommendations.tasks.precompute_active_user_recommendations",
+        "schedule": 60 * 60,  # hourly
+    },
+    "purge-expired-recommendation-cache": {
+        "task": "apps.recommendations.tasks.purge_expired_recommendation_cache",
+        "schedule": 60 * 60,  # hourly
+    },
+    # Collaborative filtering reads neighbours from UserSimilarity
+    "refresh-user-similarities": {
+        "task": "apps.recommendations.tasks.refresh_user_similarities",
+        "schedule": 24 * 60 * 60,  # daily
+    },
+}
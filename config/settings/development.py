@@ -6,7 +6,10 @@ relaxed security settings, and local database configurations.
 """
 
 import os
+from importlib.util import find_spec
+
 from .base import *
+from ._logging import build_logging
 from decouple import Config, RepositoryEnv
 
 # Load development-specific environment variables
@@ -55,50 +58,29 @@ CACHES = {
 }
 
 # Logging configuration for development
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
-        },
-        "simple": {
-            "format": "{levelname} {message}",
-            "style": "{",
-        },
-    },
-    "handlers": {
+LOGGING = build_logging(
+    handlers={
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
     },
-    "root": {
-        "handlers": ["console"],
-        "level": "DEBUG",
+    root_level="DEBUG",
+    root_handlers=["console"],
+    loggers={
+        "django": ("INFO", ["console"]),
+        "apps": ("DEBUG", ["console"]),
     },
-    "loggers": {
-        "django": {
-            "handlers": ["console"],
-            "level": "INFO",
-            "propagate": False,
-        },
-        "apps": {
-            "handlers": ["console"],
-            "level": "DEBUG",
-            "propagate": False,
-        },
-    },
-}
+)
 
-# Additional development apps
-INSTALLED_APPS += ["django_extensions"]
+# Additional development apps, when installed (find_spec does not import them)
+if find_spec("django_extensions") is not None:
+    INSTALLED_APPS += ["django_extensions"]
 
 # DRF settings for development
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
-    "rest_framework.renderers.JSONRenderer",
+    "utils.renderers.ORJSONRenderer",
     "rest_framework.renderers.BrowsableAPIRenderer",  # Enable browsable API in development
 ]
 
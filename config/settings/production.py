@@ -6,14 +6,19 @@ performance, and reliability configurations.
 """
 
 from .base import *
+from ._logging import build_logging
 import os
 
+
+def _csv(value):
+    """Split a comma-separated setting, dropping blank entries"""
+    return [item for item in (part.strip() for part in value.split(",")) if item]
+
+
 # Production security settings
 DEBUG = False
 SECRET_KEY = config("SECRET_KEY")  # Must be set in production
-ALLOWED_HOSTS = config(
-    "ALLOWED_HOSTS", cast=lambda v: [s.strip() for s in v.split(",") if s.strip()]
-)
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", cast=_csv)
 
 # Security headers and settings
 SECURE_SSL_REDIRECT = config("SECURE_SSL_REDIRECT", default=True, cast=bool)
@@ -47,14 +52,17 @@ DATABASES = {
     )
 }
 
-# Production cache (Redis)
+# Production cache (Redis); also the default Celery broker and result backend
+REDIS_URL = config("REDIS_URL")
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": config("REDIS_URL"),
+        "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "CONNECTION_POOL_KWARGS": {"max_connections": 50},
+            "COMPRESSOR": "django_redis.compressors.lz4.Lz4Compressor",
+            "PICKLE_VERSION": 5,
+            "CONNECTION_POOL_KWARGS": {"max_connections": 50, "retry_on_timeout": True},
         },
         "KEY_PREFIX": "movie_rec_prod",
         "TIMEOUT": 300,  # 5 minutes default timeout
@@ -62,17 +70,11 @@ CACHES = {
 }
 
 # CORS settings for production
-CORS_ALLOWED_ORIGINS = config(
-    "CORS_ALLOWED_ORIGINS",
-    cast=lambda v: [s.strip() for s in v.split(",") if s.strip()],
-)
+CORS_ALLOWED_ORIGINS = config("CORS_ALLOWED_ORIGINS", cast=_csv)
 CORS_ALLOW_CREDENTIALS = True
 
 # CSRF settings for production
-CSRF_TRUSTED_ORIGINS = config(
-    "CSRF_TRUSTED_ORIGINS",
-    cast=lambda v: [s.strip() for s in v.split(",") if s.strip()],
-)
+CSRF_TRUSTED_ORIGINS = config("CSRF_TRUSTED_ORIGINS", cast=_csv)
 
 # Email settings for production
 EMAIL_BACKEND = config(
@@ -88,23 +90,11 @@ DEFAULT_FROM_EMAIL = config(
 )
 
 # Production logging
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
-        },
-        "json": {
-            "format": '{"level": "%(levelname)s", "time": "%(asctime)s", "module": "%(module)s", "message": "%(message)s"}',
-            "style": "%",
-        },
-    },
-    "handlers": {
+LOGGING = build_logging(
+    handlers={
         "file": {
             "level": "INFO",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "utils.logging_handlers.QueuedRotatingFileHandler",
             "filename": "/app/logs/django.log",
             "maxBytes": 1024 * 1024 * 10,  # 10 MB
             "backupCount": 5,
@@ -117,42 +107,28 @@ LOGGING = {
         },
         "error_file": {
             "level": "ERROR",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "utils.logging_handlers.QueuedRotatingFileHandler",
             "filename": "/app/logs/django_errors.log",
             "maxBytes": 1024 * 1024 * 10,  # 10 MB
             "backupCount": 5,
             "formatter": "json",
         },
     },
-    "root": {
-        "handlers": ["console", "file"],
-        "level": "INFO",
+    root_level="INFO",
+    root_handlers=["console", "file"],
+    loggers={
+        "django": ("INFO", ["console", "file"]),
+        "django.request": ("ERROR", ["error_file"]),
+        "apps": ("INFO", ["console", "file"]),
     },
-    "loggers": {
-        "django": {
-            "handlers": ["console", "file"],
-            "level": "INFO",
-            "propagate": False,
-        },
-        "django.request": {
-            "handlers": ["error_file"],
-            "level": "ERROR",
-            "propagate": False,
-        },
-        "apps": {
-            "handlers": ["console", "file"],
-            "level": "INFO",
-            "propagate": False,
-        },
-    },
-}
+)
 
 # Production-only middleware
 MIDDLEWARE.insert(1, "django.middleware.security.SecurityMiddleware")
 
 # API settings for production
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
-    "rest_framework.renderers.JSONRenderer",
+    "utils.renderers.ORJSONRenderer",
 ]
 
 # Remove browsable API in production
@@ -165,10 +141,16 @@ REST_FRAMEWORK["DEFAULT_PERMISSION_CLASSES"] = [
 # RATELIMIT_USE_CACHE = 'default'
 
 # Celery settings for production
-CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=config("REDIS_URL"))
-CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default=config("REDIS_URL"))
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default=REDIS_URL)
+CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", default=REDIS_URL)
 CELERY_TASK_ALWAYS_EAGER = False
 CELERY_TASK_EAGER_PROPAGATES = False
+# Celery keeps its own Redis connections (kombu cannot use django-redis's
+# pool), so bound them like the cache pool and drop dead idle sockets
+CELERY_BROKER_POOL_LIMIT = 10
+CELERY_BROKER_TRANSPORT_OPTIONS = {"health_check_interval": 30}
+CELERY_REDIS_MAX_CONNECTIONS = 20
+CELERY_REDIS_RETRY_ON_TIMEOUT = True
 
 # Health check settings
 HEALTH_CHECK = {
@@ -182,7 +164,11 @@ TMDB_BASE_URL = config("TMDB_BASE_URL", default="https://api.themoviedb.org/3")
 
 # Monitoring and error tracking (Sentry configuration)
 SENTRY_DSN = config("SENTRY_DSN", default="")
-if SENTRY_DSN:
+# Only server processes report to Sentry; wsgi.py and asgi.py set
+# ENABLE_SENTRY, so management commands skip importing sentry_sdk. The
+# compose files start Celery worker and beat with ENABLE_SENTRY=1; config
+# is imported by every manage.py command, so celery.py cannot set it.
+if SENTRY_DSN and os.environ.get("ENABLE_SENTRY") == "1":
     import sentry_sdk
     from sentry_sdk.integrations.django import DjangoIntegration
     from sentry_sdk.integrations.redis import RedisIntegration
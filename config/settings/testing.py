@@ -6,6 +6,7 @@ disabled caching, and simplified configurations.
 """
 
 from .base import *
+from ._logging import build_logging
 
 # Testing-specific settings
 DEBUG = False
@@ -33,9 +34,9 @@ CACHES = {
 # Email backend for testing (in-memory)
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
-# Password hashers (faster for testing but still secure)
+# Password hashers (fast for testing; test passwords need no key stretching)
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",  # Secure and reasonably fast
+    "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 
 
@@ -51,27 +52,19 @@ class DisableMigrations:
 MIGRATION_MODULES = DisableMigrations()
 
 # Logging configuration for testing (minimal)
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "handlers": {
+LOGGING = build_logging(
+    handlers={
         "console": {
             "level": "ERROR",
             "class": "logging.StreamHandler",
         },
     },
-    "root": {
-        "handlers": ["console"],
-        "level": "ERROR",
+    root_level="ERROR",
+    root_handlers=["console"],
+    loggers={
+        "django": ("ERROR", ["console"]),
     },
-    "loggers": {
-        "django": {
-            "handlers": ["console"],
-            "level": "ERROR",
-            "propagate": False,
-        },
-    },
-}
+)
 
 # JWT settings for testing (shorter token lifetimes)
 SIMPLE_JWT = {
@@ -15,9 +15,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import json
+import time
+
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_http_methods
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -25,41 +30,53 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+# The bodies below never change, so they are serialized once at import; the
+# health check only fills in the current time
+HEALTH_CHECK_BODY = json.dumps(
+    {
+        "status": "healthy",
+        "service": "Movie Recommendation API",
+        "version": "1.0.0",
+        "timestamp": "%s",
+    }
+).encode()
 
-@require_http_methods(["GET"])
+API_ROOT_BODY = json.dumps(
+    {
+        "message": "Welcome to Movie Recommendation API",
+        "version": "1.0.0",
+        "documentation": {
+            "swagger": "/api/docs/",
+            "redoc": "/api/redoc/",
+            "openapi_schema": "/api/schema/",
+        },
+        "endpoints": {
+            "authentication": "/api/v1/auth/",
+            "movies": "/api/v1/movies/",
+            "favorites": "/api/v1/favorites/",
+            "preferences": "/api/v1/preferences/",
+            "recommendations": "/api/v1/recommendations/",
+        },
+    }
+).encode()
+
+
+@require_http_methods(["GET", "HEAD"])
+@cache_control(max_age=5, public=True)  # Lets proxies absorb bursts of probes
 def health_check(request):
     """Health check endpoint for monitoring and load balancers."""
-    return JsonResponse(
-        {
-            "status": "healthy",
-            "service": "Movie Recommendation API",
-            "version": "1.0.0",
-            "timestamp": "2025-08-10T00:00:00Z",
-        }
-    )
+    if request.method == "HEAD":
+        # Probes only need the status code
+        return HttpResponse(content_type="application/json")
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()).encode()
+    return HttpResponse(HEALTH_CHECK_BODY % timestamp, content_type="application/json")
 
 
 @require_http_methods(["GET"])
+@gzip_page
 def api_root(request):
     """API root endpoint with available endpoints."""
-    return JsonResponse(
-        {
-            "message": "Welcome to Movie Recommendation API",
-            "version": "1.0.0",
-            "documentation": {
-                "swagger": "/api/docs/",
-                "redoc": "/api/redoc/",
-                "openapi_schema": "/api/schema/",
-            },
-            "endpoints": {
-                "authentication": "/api/v1/auth/",
-                "movies": "/api/v1/movies/",
-                "favorites": "/api/v1/favorites/",
-                "preferences": "/api/v1/preferences/",
-                "recommendations": "/api/v1/recommendations/",
-            },
-        }
-    )
+    return HttpResponse(API_ROOT_BODY, content_type="application/json")
 
 
 urlpatterns = [
@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Report errors to Sentry from server processes (see production settings)
+os.environ.setdefault('ENABLE_SENTRY', '1')
 
 application = get_wsgi_application()
@@ -2,18 +2,14 @@
 """
 Health check script for post-deployment testing.
 """
+import socket
 import sys
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
-from requests import get
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from urllib.request import Request, urlopen
 
 
 def health_check(url: str, timeout: int = 30) -> bool:
-    # Validate URL to prevent SSRF
-    parsed = urlparse(url)
-    if not parsed.scheme in ['http', 'https'] or not parsed.netloc:
-        print(f"❌ Invalid URL format: {url}")
-        return False
     """
     Perform health check on the given URL.
     
@@ -24,30 +20,37 @@ def health_check(url: str, timeout: int = 30) -> bool:
     Returns:
         bool: True if health check passes, False otherwise
     """
+    # Validate URL to prevent SSRF
+    parsed = urlparse(url)
+    if not parsed.scheme in ['http', 'https'] or not parsed.netloc:
+        print(f"❌ Invalid URL format: {url}")
+        return False
+
     try:
         print(f"🔍 Checking health endpoint: {url}")
-        response = get(url, timeout=timeout)
-        
-        if response.status_code == 200:
-            print("✅ Health check passed")
-            return True
-        else:
-            print(f"❌ Health check failed with status code: {response.status_code}")
-            return False
-            
-    except Timeout:
+        # HEAD: only the status code is checked, so skip the response body
+        with urlopen(Request(url, method="HEAD"), timeout=timeout) as response:
+            status_code = response.status
+    except HTTPError as e:
+        status_code = e.code
+    except (socket.timeout, TimeoutError):
         print(f"❌ Health check failed: Request timeout after {timeout}s")
         return False
-    except ConnectionError:
-        print("❌ Health check failed: Connection error")
-        return False
-    except RequestException as e:
-        print(f"❌ Health check failed: {e}")
+    except URLError as e:
+        if isinstance(e.reason, (socket.timeout, TimeoutError)):
+            print(f"❌ Health check failed: Request timeout after {timeout}s")
+        else:
+            print("❌ Health check failed: Connection error")
         return False
     except Exception as e:
         print(f"❌ Unexpected error during health check: {e}")
         return False
 
+    if status_code == 200:
+        print("✅ Health check passed")
+        return True
+    print(f"❌ Health check failed with status code: {status_code}")
+    return False
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
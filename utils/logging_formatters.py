@@ -0,0 +1,34 @@
+"""
+Logging formatters for the Movie Recommendation Backend.
+
+JSONFormatter writes each record as one JSON object per line, escaping
+quotes and newlines in messages so the log stays machine-readable.
+"""
+
+import json
+import logging
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format records as compact JSON objects.
+
+    Each object has the record's level, time, module and message, plus the
+    formatted traceback under "exc_info" when the record carries one.
+    """
+
+    def format(self, record):
+        entry = {
+            "level": record.levelname,
+            "time": self.formatTime(record, self.datefmt),
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, separators=(",", ":"))
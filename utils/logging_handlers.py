@@ -0,0 +1,65 @@
+"""
+Logging handlers for the Movie Recommendation Backend.
+
+QueuedRotatingFileHandler keeps log file writes off the request path: records
+are put on an in-memory queue and written to disk by a background thread.
+"""
+
+import atexit
+import os
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+
+
+class QueuedRotatingFileHandler(QueueHandler):
+    """
+    Queue-backed handler that writes to a (rotating) log file.
+
+    Accepts RotatingFileHandler's arguments, so it can replace FileHandler or
+    RotatingFileHandler in LOGGING; with the default maxBytes=0 the file never
+    rolls over. Records are formatted with this handler's formatter when they
+    are queued. The writer thread is started lazily in each process, so
+    workers forked after logging is configured still get one.
+    """
+
+    def __init__(
+        self, filename, mode="a", maxBytes=0, backupCount=0, encoding=None, delay=True
+    ):
+        super().__init__(SimpleQueue())
+        self.target = RotatingFileHandler(
+            filename, mode, maxBytes, backupCount, encoding, delay
+        )
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def enqueue(self, record):
+        """Queue a record, starting this process's writer thread if needed."""
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().enqueue(record)
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # Records queued before a fork belong to the parent process
+            self.queue = SimpleQueue()
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+            atexit.register(self._stop_listener)
+
+    def _stop_listener(self):
+        """Write out queued records and stop this process's writer thread."""
+        with self._listener_lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+
+    def close(self):
+        self._stop_listener()
+        self.target.close()
+        super().close()
@@ -0,0 +1,59 @@
+"""
+Response renderers for the Movie Recommendation Backend.
+
+ORJSONRenderer encodes API responses with orjson, which walks the response
+data in native code instead of the stdlib json module's Python encoder.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+# Dates and dataclasses orjson would otherwise encode itself; handing them to
+# DRF's encoder keeps their format the same as JSONRenderer's. Non-str dict
+# keys (such as movie or genre IDs) are written as strings, as json does
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_NON_STR_KEYS
+)
+
+# UTF-8 encodings of the characters JSONRenderer escapes
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes compact responses with orjson.
+
+    Values orjson cannot encode natively (Decimal, lazy strings, datetimes,
+    numpy scalars, ...) go through DRF's JSONEncoder. Indented or ASCII-only
+    output, as used by the browsable API, and data orjson cannot encode fall
+    back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape U+2028 and U+2029 as JSONRenderer does, so the output stays
+        # a strict JavaScript subset
+        return ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+            PARAGRAPH_SEPARATOR, b"\\u2029"
+        )
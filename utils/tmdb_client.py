@@ -5,23 +5,53 @@ This module provides a comprehensive client for interacting with The Movie Datab
 It handles authentication, rate limiting, error handling, and caching for optimal performance.
 """
 
+import hashlib
 import logging
+import math
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union
-from urllib.parse import urljoin
 
+import orjson
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.core.cache import cache
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Token bucket shared by every process using the same Redis. Tokens refill
+# continuously; a caller takes one and, when the bucket is empty, is told
+# how long to wait for its token. Times come from the Redis server, so
+# workers on different hosts agree on them.
+RATE_LIMIT_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
 
 class TMDbAPIError(Exception):
     """Custom exception for TMDb API errors."""
 
-    pass
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class TMDbRateLimitError(TMDbAPIError):
@@ -49,12 +79,56 @@ class TMDbClient:
         "movie_details": 24 * 60 * 60,  # 24 hours
         "genres": 24 * 60 * 60,  # 24 hours
         "search": 15 * 60,  # 15 minutes
+        "not_found": 5 * 60,  # 5 minutes
+        "client_error": 60,  # 1 minute
+    }
+
+    # How long past its cache timeout an entry is still served while it is
+    # refreshed in the background
+    STALE_TIMEOUTS = {
+        "trending": 15 * 60,  # 15 minutes
+        "popular": 30 * 60,  # 30 minutes
+        "movie_details": 6 * 60 * 60,  # 6 hours
+        "genres": 24 * 60 * 60,  # 24 hours
     }
 
+    # Cached in place of a response TMDb rejected, mapped to its status code
+    MISSING_RESPONSE_KEY = "__tmdb_missing__"
+
     # Rate limiting
     RATE_LIMIT_REQUESTS = 40  # TMDb allows 40 requests per 10 seconds
     RATE_LIMIT_WINDOW = 10  # 10 seconds
 
+    # Concurrent requests made by bulk helpers, shared by all their callers
+    # in a process
+    BULK_MAX_WORKERS = 8
+
+    # Sub-resources fetched along with movie details; each is also served
+    # by its own method from cached details. Images and keywords are not
+    # used and would make up most of the cached payload
+    MOVIE_DETAILS_APPEND = "credits,videos,recommendations"
+
+    # Keep-alive connections to TMDb kept per process; threads share the
+    # client, so this covers several bulk fetches running at once
+    CONNECTION_POOL_SIZE = 32
+
+    # Per-attempt timeout and retries of transient failures; urllib3 sleeps
+    # RETRY_BACKOFF_FACTOR * 2 ** n seconds before the (n + 1)th retry
+    REQUEST_TIMEOUT = 10
+    REQUEST_RETRIES = 3
+    RETRY_BACKOFF_FACTOR = 0.3
+
+    # Concurrent misses on one cache key wait for a single fetch: the lock
+    # outlives the slowest fetch, every attempt timing out plus the backoff
+    # between them, and waiters poll the cache for up to SINGLE_FLIGHT_WAIT
+    # seconds before fetching themselves
+    SINGLE_FLIGHT_TIMEOUT = math.ceil(
+        (REQUEST_RETRIES + 1) * REQUEST_TIMEOUT
+        + RETRY_BACKOFF_FACTOR * (2**REQUEST_RETRIES - 1)
+    )
+    SINGLE_FLIGHT_WAIT = 5
+    SINGLE_FLIGHT_POLL_INTERVAL = 0.1
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize TMDb client.
@@ -70,34 +144,90 @@ class TMDbClient:
 
         self.session = requests.Session()
         self.session.params = {"api_key": self.api_key} if self.api_key else {}
+        # Reuse connections across threads and retry transient failures;
+        # 429 responses are left to _make_request
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=self.CONNECTION_POOL_SIZE,
+                max_retries=Retry(
+                    total=self.REQUEST_RETRIES,
+                    backoff_factor=self.RETRY_BACKOFF_FACTOR,
+                    status_forcelist=[500, 502, 503, 504],
+                    allowed_methods=["GET"],
+                    raise_on_status=False,
+                ),
+            ),
+        )
+
+        # Rate limiting: a token bucket in Redis shared by all workers, or in
+        # this process when the cache is not Redis-backed
+        self._rate_limit_script = None
+        self._rate_limit_key = (
+            "tmdb_rate_limit_" + hashlib.md5(str(self.api_key).encode()).hexdigest()
+        )
+        self._tokens = float(self.RATE_LIMIT_REQUESTS)
+        self._tokens_updated = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
 
-        # Rate limiting tracking
-        self._request_times = []
+        # Worker threads for bulk helpers, started lazily in each process
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
 
     def _check_rate_limit(self) -> None:
         """Check and enforce rate limiting."""
-        current_time = time.time()
+        wait = self._consume_token()
+        if wait > 0:
+            logger.info(f"Rate limit reached. Sleeping for {wait:.2f} seconds.")
+            time.sleep(wait)
 
-        # Remove old requests outside the window
-        self._request_times = [
-            req_time
-            for req_time in self._request_times
-            if current_time - req_time < self.RATE_LIMIT_WINDOW
-        ]
+    def _consume_token(self) -> float:
+        """
+        Take a token from the rate limit bucket.
 
-        # Check if we're at the limit
-        if len(self._request_times) >= self.RATE_LIMIT_REQUESTS:
-            sleep_time = self.RATE_LIMIT_WINDOW - (
-                current_time - self._request_times[0]
-            )
-            if sleep_time > 0:
-                logger.info(
-                    f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds."
+        Returns:
+            Seconds to wait before making the request (0 if a token was free)
+        """
+        rate = self.RATE_LIMIT_REQUESTS / self.RATE_LIMIT_WINDOW
+        script = self._get_rate_limit_script()
+        if script is not None:
+            try:
+                return float(
+                    script(
+                        keys=[self._rate_limit_key],
+                        args=[self.RATE_LIMIT_REQUESTS, rate],
+                    )
                 )
-                time.sleep(sleep_time)
-
-        # Add current request time
-        self._request_times.append(current_time)
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable, using local one: {e}")
+
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            self._tokens = (
+                min(
+                    self.RATE_LIMIT_REQUESTS,
+                    self._tokens + (now - self._tokens_updated) * rate,
+                )
+                - 1
+            )
+            self._tokens_updated = now
+            return max(0.0, -self._tokens / rate)
+
+    def _get_rate_limit_script(self):
+        """Get the shared token bucket script, or None without Redis."""
+        if self._rate_limit_script is None:
+            try:
+                from django_redis import get_redis_connection
+
+                self._rate_limit_script = get_redis_connection(
+                    "default"
+                ).register_script(RATE_LIMIT_SCRIPT)
+            except (ImportError, NotImplementedError):
+                # The cache backend is not django-redis
+                self._rate_limit_script = False
+        return self._rate_limit_script or None
 
     def _make_request(
         self,
@@ -105,15 +235,21 @@ class TMDbClient:
         params: Optional[Dict[str, Any]] = None,
         cache_key: Optional[str] = None,
         cache_timeout: Optional[int] = None,
+        stale_timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Make a request to TMDb API with error handling and caching.
 
+        When several callers miss the same cache key at once, one of them
+        makes the request and the rest wait for its cached response.
+
         Args:
             endpoint: API endpoint path
             params: Additional query parameters
             cache_key: Cache key for storing response
             cache_timeout: Cache timeout in seconds
+            stale_timeout: Seconds past cache_timeout the response is still
+                served while a background request refreshes it
 
         Returns:
             API response data
@@ -125,24 +261,148 @@ class TMDbClient:
         if not self.api_key:
             raise TMDbAPIError("TMDb API key not configured")
 
+        fetch_args = (endpoint, params, cache_key, cache_timeout, stale_timeout)
+
         # Check cache first
         if cache_key:
-            cached_data = cache.get(cache_key)
+            entry = cache.get(cache_key)
+            cached_data = self._get_cached_response(cache_key, entry)
+            if cached_data:
+                if self._is_stale(entry):
+                    self._refresh_in_background([cache_key], self._fetch, *fetch_args)
+                return cached_data
+
+        if not (cache_key and cache_timeout):
+            return self._fetch(*fetch_args)
+
+        # Let one caller fetch a missing entry while the others wait for it
+        lock_key = f"{cache_key}_fetching"
+        if cache.add(lock_key, True, self.SINGLE_FLIGHT_TIMEOUT):
+            try:
+                return self._fetch(*fetch_args)
+            finally:
+                cache.delete(lock_key)
+
+        deadline = time.monotonic() + self.SINGLE_FLIGHT_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.SINGLE_FLIGHT_POLL_INTERVAL)
+            entries = cache.get_many([cache_key, lock_key])
+            cached_data = self._get_cached_response(cache_key, entries.get(cache_key))
             if cached_data:
-                logger.debug(f"Cache hit for key: {cache_key}")
                 return cached_data
+            if lock_key not in entries:
+                # The fetch failed without caching anything
+                break
+
+        return self._fetch(*fetch_args)
+
+    def _get_cached_response(
+        self, cache_key: str, cached_data: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached response, or raise for a cached rejected request.
+
+        Args:
+            cache_key: Cache key the entry was read from
+            cached_data: The cached entry, None on a cache miss
+
+        Returns:
+            The cached response data, or None on a cache miss
+
+        Raises:
+            TMDbAPIError: If the cached entry marks a rejected request
+        """
+        cached_data = self._entry_data(cached_data)
+        if not cached_data:
+            return None
+        logger.debug(f"Cache hit for key: {cache_key}")
+        if self.MISSING_RESPONSE_KEY in cached_data:
+            status_code = cached_data[self.MISSING_RESPONSE_KEY]
+            raise TMDbAPIError(f"HTTP error: {status_code}", status_code=status_code)
+        return cached_data
+
+    @staticmethod
+    def _cache_entry(
+        data: Dict[str, Any], cache_timeout: int, stale_timeout: Optional[int]
+    ) -> tuple:
+        """
+        Build the cache entry for a response and the timeout to store it for.
+
+        With a stale timeout the response is stored alongside the time it
+        should be refreshed after, and kept stale_timeout seconds longer.
+        """
+        if not stale_timeout:
+            return data, cache_timeout
+        return (data, time.time() + cache_timeout), cache_timeout + stale_timeout
+
+    @staticmethod
+    def _entry_data(entry: Any) -> Any:
+        """Return the response stored in a cache entry"""
+        return entry[0] if isinstance(entry, tuple) else entry
+
+    @staticmethod
+    def _is_stale(entry: Any) -> bool:
+        """Whether a cache entry is past the time it should be refreshed after"""
+        return isinstance(entry, tuple) and entry[1] <= time.time()
+
+    def _refresh_in_background(self, cache_keys: List[str], refresh, *args) -> None:
+        """
+        Refresh stale cache entries on a background thread.
+
+        Entries another caller is already fetching are left to it; if all
+        of them are, no thread is started.
+
+        Args:
+            cache_keys: Cache keys being refreshed
+            refresh: Callable that refetches and caches the entries
+            *args: Arguments for refresh
+        """
+        lock_keys = [
+            f"{cache_key}_fetching"
+            for cache_key in cache_keys
+            if cache.add(f"{cache_key}_fetching", True, self.SINGLE_FLIGHT_TIMEOUT)
+        ]
+        if not lock_keys:
+            return
+
+        def run():
+            try:
+                refresh(*args)
+            except Exception as e:
+                logger.warning(f"Could not refresh cached TMDb data: {e}")
+            finally:
+                cache.delete_many(lock_keys)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache_key: Optional[str] = None,
+        cache_timeout: Optional[int] = None,
+        stale_timeout: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Request an endpoint from TMDb and cache the response.
 
+        Takes the same arguments as _make_request, which checks the cache
+        before calling this.
+        """
         # Check rate limit
         self._check_rate_limit()
 
         # Prepare request
-        url = urljoin(self.BASE_URL, endpoint)
+        # Endpoints are relative paths under BASE_URL
+        url = self.BASE_URL + endpoint
         request_params = params or {}
 
         response = None
         try:
             logger.debug(f"Making request to: {url} with params: {request_params}")
-            response = self.session.get(url, params=request_params, timeout=10)
+            response = self.session.get(
+                url, params=request_params, timeout=self.REQUEST_TIMEOUT
+            )
 
             # Handle rate limiting
             if response.status_code == 429:
@@ -156,11 +416,15 @@ class TMDbClient:
             # Handle other errors
             response.raise_for_status()
 
-            data = response.json()
+            # orjson decodes the body bytes directly; its JSONDecodeError is
+            # a ValueError, handled below
+            data = orjson.loads(response.content)
 
             # Cache successful response
             if cache_key and cache_timeout:
-                cache.set(cache_key, data, cache_timeout)
+                cache.set(
+                    cache_key, *self._cache_entry(data, cache_timeout, stale_timeout)
+                )
                 logger.debug(
                     f"Cached response with key: {cache_key} for {cache_timeout} seconds"
                 )
@@ -174,9 +438,11 @@ class TMDbClient:
             logger.error(f"Connection error for request to {url}")
             raise TMDbAPIError("Connection error")
         except requests.exceptions.HTTPError as e:
-            status_code = response.status_code if response else "Unknown"
+            status_code = response.status_code if response is not None else None
             logger.error(f"HTTP error {status_code} for request to {url}: {e}")
-            raise TMDbAPIError(f"HTTP error: {status_code}")
+            if cache_key:
+                self._cache_error(cache_key, status_code)
+            raise TMDbAPIError(f"HTTP error: {status_code}", status_code=status_code)
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error for {url}: {e}")
             raise TMDbAPIError(f"Request error: {str(e)}")
@@ -184,6 +450,25 @@ class TMDbClient:
             logger.error(f"Invalid JSON response from {url}: {e}")
             raise TMDbAPIError("Invalid JSON response")
 
+    def _cache_error(self, cache_key: str, status_code: Optional[int]) -> None:
+        """
+        Briefly cache a rejected request so repeats fail without a request.
+
+        Not found responses are cached longest; other client errors, apart
+        from authentication failures and rate limiting, for a minute.
+
+        Args:
+            cache_key: Cache key the response would have been stored under
+            status_code: HTTP status code of the response
+        """
+        if status_code == 404:
+            timeout = self.CACHE_TIMEOUTS["not_found"]
+        elif status_code and 400 <= status_code < 500 and status_code not in (401, 429):
+            timeout = self.CACHE_TIMEOUTS["client_error"]
+        else:
+            return
+        cache.set(cache_key, {self.MISSING_RESPONSE_KEY: status_code}, timeout)
+
     def get_trending_movies(
         self, time_window: str = "day", page: int = 1
     ) -> Dict[str, Any]:
@@ -202,7 +487,11 @@ class TMDbClient:
         params = {"page": page}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["trending"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["trending"],
+            self.STALE_TIMEOUTS["trending"],
         )
 
     def get_popular_movies(self, page: int = 1) -> Dict[str, Any]:
@@ -220,7 +509,11 @@ class TMDbClient:
         params = {"page": page}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["popular"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["popular"],
+            self.STALE_TIMEOUTS["popular"],
         )
 
     def get_movie_details(self, movie_id: int) -> Dict[str, Any]:
@@ -235,14 +528,113 @@ class TMDbClient:
         """
         cache_key = f"movie_details_{movie_id}"
         endpoint = f"movie/{movie_id}"
-        params = {
-            "append_to_response": "credits,videos,images,keywords,recommendations"
-        }
+        params = {"append_to_response": self.MOVIE_DETAILS_APPEND}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["movie_details"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["movie_details"],
+            self.STALE_TIMEOUTS["movie_details"],
         )
 
+    def get_movie_details_bulk(self, movie_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get detailed information about several movies.
+
+        Cached details are read in a single cache round trip, the remaining
+        movies are fetched concurrently and stored in one more round trip.
+        Stale details are returned and refreshed in the background. Movies
+        that fail to load are omitted.
+
+        Args:
+            movie_ids: TMDb movie IDs
+
+        Returns:
+            Movie details data keyed by movie ID
+        """
+        movie_ids = list(dict.fromkeys(movie_ids))
+        cache_keys = {f"movie_details_{movie_id}": movie_id for movie_id in movie_ids}
+        cached = {
+            cache_keys[key]: entry
+            for key, entry in cache.get_many(cache_keys).items()
+            if entry
+        }
+        details = {
+            movie_id: self._entry_data(entry)
+            for movie_id, entry in cached.items()
+            if self.MISSING_RESPONSE_KEY not in self._entry_data(entry)
+        }
+
+        stale = [
+            movie_id for movie_id, entry in cached.items() if self._is_stale(entry)
+        ]
+        if stale:
+            self._refresh_in_background(
+                [f"movie_details_{movie_id}" for movie_id in stale],
+                self._fetch_movie_details,
+                stale,
+            )
+
+        missing = [movie_id for movie_id in movie_ids if movie_id not in cached]
+        if missing:
+            details.update(self._fetch_movie_details(missing))
+
+        return details
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Return this process's executor for bulk requests.
+
+        Reusing its threads saves starting new ones for every bulk call.
+        Threads do not survive a fork, so a forked worker starts its own.
+        """
+        if self._executor_pid != os.getpid():
+            with self._executor_lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.BULK_MAX_WORKERS, thread_name_prefix="tmdb"
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _fetch_movie_details(self, movie_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Fetch details for movies known to be missing from the cache.
+
+        The movies are fetched concurrently without another cache lookup
+        each, and the results are cached together.
+
+        Args:
+            movie_ids: TMDb movie IDs
+
+        Returns:
+            Movie details data keyed by movie ID, without movies that failed
+        """
+        params = {"append_to_response": self.MOVIE_DETAILS_APPEND}
+        executor = self._get_executor()
+        futures = {
+            movie_id: executor.submit(self._fetch, f"movie/{movie_id}", params)
+            for movie_id in movie_ids
+        }
+        fetched = {}
+        for movie_id, future in futures.items():
+            try:
+                fetched[movie_id] = future.result()
+            except TMDbAPIError as e:
+                logger.warning(f"Could not load details for movie {movie_id}: {e}")
+                self._cache_error(f"movie_details_{movie_id}", e.status_code)
+        if fetched:
+            entries, timeout = {}, None
+            for movie_id, data in fetched.items():
+                entries[f"movie_details_{movie_id}"], timeout = self._cache_entry(
+                    data,
+                    self.CACHE_TIMEOUTS["movie_details"],
+                    self.STALE_TIMEOUTS["movie_details"],
+                )
+            cache.set_many(entries, timeout)
+        return fetched
+
     def search_movies(
         self,
         query: str,
@@ -262,7 +654,10 @@ class TMDbClient:
         Returns:
             Search results data
         """
-        cache_key = f"search_movies_{hash(query)}_{page}_{year}_{include_adult}"
+        # hash() is salted per process; a stable digest shares entries
+        # across workers
+        query_digest = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+        cache_key = f"search_movies_{query_digest}_{page}_{year}_{include_adult}"
         endpoint = "search/movie"
         params = {"query": query, "page": page, "include_adult": include_adult}
 
@@ -284,7 +679,10 @@ class TMDbClient:
         endpoint = "genre/movie/list"
 
         return self._make_request(
-            endpoint, cache_key=cache_key, cache_timeout=self.CACHE_TIMEOUTS["genres"]
+            endpoint,
+            cache_key=cache_key,
+            cache_timeout=self.CACHE_TIMEOUTS["genres"],
+            stale_timeout=self.STALE_TIMEOUTS["genres"],
         )
 
     def get_top_rated_movies(self, page: int = 1) -> Dict[str, Any]:
@@ -302,7 +700,11 @@ class TMDbClient:
         params = {"page": page}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["popular"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["popular"],
+            self.STALE_TIMEOUTS["popular"],
         )
 
     def get_now_playing_movies(self, page: int = 1) -> Dict[str, Any]:
@@ -320,7 +722,11 @@ class TMDbClient:
         params = {"page": page}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["trending"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["trending"],
+            self.STALE_TIMEOUTS["trending"],
         )
 
     def get_upcoming_movies(self, page: int = 1) -> Dict[str, Any]:
@@ -338,7 +744,11 @@ class TMDbClient:
         params = {"page": page}
 
         return self._make_request(
-            endpoint, params, cache_key, self.CACHE_TIMEOUTS["trending"]
+            endpoint,
+            params,
+            cache_key,
+            self.CACHE_TIMEOUTS["trending"],
+            self.STALE_TIMEOUTS["trending"],
         )
 
     def discover_movies(
@@ -377,8 +787,12 @@ class TMDbClient:
         if year:
             params["year"] = year
 
-        # Create cache key from sorted params
-        cache_key = f"discover_movies_{hash(str(sorted(params.items())))}"
+        # Create cache key from sorted params. hash() is salted per process,
+        # so a stable digest is used to share entries across workers.
+        params_digest = hashlib.blake2b(
+            str(sorted(params.items())).encode(), digest_size=16
+        ).hexdigest()
+        cache_key = f"discover_movies_{params_digest}"
         endpoint = "discover/movie"
 
         return self._make_request(
@@ -393,7 +807,7 @@ class TMDbClient:
         Args:
             path: Image path from TMDb response
             size: Image size (w92, w154, w185, w342, w500, w780, original)
-            secure: Use HTTPS
+            secure: Use HTTPS; IMAGE_BASE_URL is always HTTPS
 
         Returns:
             Full image URL
@@ -401,11 +815,28 @@ class TMDbClient:
         if not path:
             return ""
 
-        base_url = TMDbClient.IMAGE_BASE_URL
-        if secure:
-            base_url = base_url.replace("http://", "https://")
+        return f"{TMDbClient.IMAGE_BASE_URL}{size}{path}"
+
+    def _get_cached_details_part(
+        self, movie_id: int, part: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a sub-resource from cached movie details, if they are cached.
+
+        get_movie_details appends credits, videos and recommendations, so
+        when its response is cached they need no separate request.
+
+        Args:
+            movie_id: TMDb movie ID
+            part: append_to_response name of the sub-resource
 
-        return f"{base_url}{size}{path}"
+        Returns:
+            The sub-resource shaped like its own endpoint's response, or None
+        """
+        details = self._entry_data(cache.get(f"movie_details_{movie_id}"))
+        if not details or not isinstance(details.get(part), dict):
+            return None
+        return {"id": movie_id, **details[part]}
 
     def get_movie_videos(self, movie_id: int) -> Dict[str, Any]:
         """
@@ -417,6 +848,10 @@ class TMDbClient:
         Returns:
             Movie videos data
         """
+        cached = self._get_cached_details_part(movie_id, "videos")
+        if cached is not None:
+            return cached
+
         cache_key = f"movie_videos_{movie_id}"
         endpoint = f"movie/{movie_id}/videos"
 
@@ -424,6 +859,7 @@ class TMDbClient:
             endpoint,
             cache_key=cache_key,
             cache_timeout=self.CACHE_TIMEOUTS["movie_details"],
+            stale_timeout=self.STALE_TIMEOUTS["movie_details"],
         )
 
     def get_movie_credits(self, movie_id: int) -> Dict[str, Any]:
@@ -436,6 +872,10 @@ class TMDbClient:
         Returns:
             Movie credits data
         """
+        cached = self._get_cached_details_part(movie_id, "credits")
+        if cached is not None:
+            return cached
+
         cache_key = f"movie_credits_{movie_id}"
         endpoint = f"movie/{movie_id}/credits"
 
@@ -443,6 +883,7 @@ class TMDbClient:
             endpoint,
             cache_key=cache_key,
             cache_timeout=self.CACHE_TIMEOUTS["movie_details"],
+            stale_timeout=self.STALE_TIMEOUTS["movie_details"],
         )
 
     def get_movie_recommendations(self, movie_id: int, page: int = 1) -> Dict[str, Any]:
@@ -456,6 +897,12 @@ class TMDbClient:
         Returns:
             Movie recommendations data
         """
+        if page == 1:
+            # Cached movie details carry the first page
+            cached = self._get_cached_details_part(movie_id, "recommendations")
+            if cached is not None:
+                return cached
+
         cache_key = f"movie_recommendations_{movie_id}_{page}"
         endpoint = f"movie/{movie_id}/recommendations"
         params = {"page": page}